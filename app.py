@@ -1,20 +1,36 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session
+import json
 import os
+import threading
 from werkzeug.utils import secure_filename
-from models.classifier import classify
-from models.ner import extract_entities, get_entity_texts
-from models.qa import answer_question, get_legal_references
-from models.document_processor import process_document
-from models.translator import translate_text, detect_language
+from models.document_processor import ExtractionPool
+from models.classifier import configure_classifier, get_classifier_stats
+from models.translator import translate_text
+from models.pipeline import (MAX_BATCH_SIZE, RESULT_CACHE_BYTES, RESULT_CACHE_TTL, analyze_batch, analyze_request,
+                             configure_result_cache, get_result_cache_stats, iter_analyze_batch)
+from models.language_detection import init_language_detector
+from models.metrics import METRICS_ENABLED, render_metrics, stage_timer
 from models.feedback import save_feedback, get_feedback_stats
-from models.legal_database import search_legal_database
 from models.chatbot import LegalChatbot
+from models.chat_sessions import create_session_backend
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # For session management
 
-# Global dictionary to store chatbot instances
-chatbot_instances = {}
+# Chat session state backend: memory:// (this process only), sqlite:///path
+# or redis://host:port/db. Sessions are bounded by count (in memory) and
+# idle time in seconds.
+app.config['CHAT_SESSION_BACKEND'] = os.environ.get('CHAT_SESSION_BACKEND', 'memory://')
+app.config['CHAT_SESSION_CAPACITY'] = int(os.environ.get('CHAT_SESSION_CAPACITY', 10000))
+app.config['CHAT_SESSION_TTL'] = float(os.environ.get('CHAT_SESSION_TTL', 1800))
+app.config['CHAT_HISTORY_DEPTH'] = int(os.environ.get('CHAT_HISTORY_DEPTH', 50))
+
+# One stateless chatbot; conversation state is loaded from the backend
+legal_chatbot = LegalChatbot(create_session_backend(
+    app.config['CHAT_SESSION_BACKEND'],
+    app.config['CHAT_SESSION_CAPACITY'],
+    app.config['CHAT_SESSION_TTL']
+), history_depth=app.config['CHAT_HISTORY_DEPTH'])
 
 # Configure upload folder
 UPLOAD_FOLDER = 'uploads'
@@ -25,6 +41,53 @@ if not os.path.exists(UPLOAD_FOLDER):
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# Document parsing runs in separate processes with a concurrency cap and a
+# per-document time budget (seconds)
+app.config['EXTRACTION_WORKERS'] = int(os.environ.get('EXTRACTION_WORKERS', 2))
+app.config['EXTRACTION_TIMEOUT'] = float(os.environ.get('EXTRACTION_TIMEOUT', 30))
+
+# Workers start on the first upload in each process, so forked web workers never share them
+extraction_pool = ExtractionPool(app.config['EXTRACTION_WORKERS'], app.config['EXTRACTION_TIMEOUT'])
+
+# Domain classifier: "keywords" or "learned" (a TF-IDF model trained with
+# python -m models.learned_classifier); low-confidence learned predictions
+# fall back to keywords
+app.config['CLASSIFIER_BACKEND'] = os.environ.get('CLASSIFIER_BACKEND', 'keywords')
+app.config['LEARNED_MODEL_DIR'] = os.environ.get('LEARNED_MODEL_DIR', 'data/classifier_model')
+app.config['LEARNED_MIN_CONFIDENCE'] = float(os.environ.get('LEARNED_MIN_CONFIDENCE', 0.0))
+
+# Concurrent requests are micro-batched into one model call of at most
+# CLASSIFY_BATCH_SIZE items, waiting up to CLASSIFY_BATCH_WAIT_MS for it to fill
+app.config['CLASSIFY_BATCH_SIZE'] = int(os.environ.get('CLASSIFY_BATCH_SIZE', 32))
+app.config['CLASSIFY_BATCH_WAIT_MS'] = float(os.environ.get('CLASSIFY_BATCH_WAIT_MS', 2.0))
+# Seconds a request waits for its batch before classifying by keywords instead
+app.config['CLASSIFY_TIMEOUT'] = float(os.environ.get('CLASSIFY_TIMEOUT', 1.0))
+
+configure_classifier(app.config['CLASSIFIER_BACKEND'], app.config['LEARNED_MODEL_DIR'],
+                     app.config['LEARNED_MIN_CONFIDENCE'], app.config['CLASSIFY_BATCH_SIZE'],
+                     app.config['CLASSIFY_BATCH_WAIT_MS'], app.config['CLASSIFY_TIMEOUT'])
+
+# Whole-pipeline result cache, bounded by total result size in bytes (0
+# disables it) and by age in seconds
+app.config['RESULT_CACHE_BYTES'] = int(os.environ.get('RESULT_CACHE_BYTES', RESULT_CACHE_BYTES))
+app.config['RESULT_CACHE_TTL'] = float(os.environ.get('RESULT_CACHE_TTL', RESULT_CACHE_TTL))
+
+configure_result_cache(app.config['RESULT_CACHE_BYTES'], app.config['RESULT_CACHE_TTL'])
+
+# Per-stage timing exposed at /metrics; set METRICS_ENABLED=0 (read when
+# models.metrics is imported) to turn instrumentation off entirely
+app.config['METRICS_ENABLED'] = METRICS_ENABLED
+
+# Batch analysis limit for /api/analyze
+app.config['MAX_BATCH_SIZE'] = int(os.environ.get('MAX_BATCH_SIZE', MAX_BATCH_SIZE))
+
+# Load the language profiles in the background at startup rather than on the
+# first language=auto request; set to 0 on workers that never auto-detect
+app.config['PRELOAD_LANGUAGE_DETECTOR'] = os.environ.get('PRELOAD_LANGUAGE_DETECTOR', '1') == '1'
+
+if app.config['PRELOAD_LANGUAGE_DETECTOR']:
+    threading.Thread(target=init_language_detector, name='langdetect-warmup', daemon=True).start()
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -32,42 +95,21 @@ def allowed_file(filename):
 def index():
     if request.method == 'POST':
         user_input = request.form.get('user_input', '')
-        language = request.form.get('language', 'en')
-        
-        # Detect language if not specified
-        if language == 'auto':
-            detected_lang = detect_language(user_input)
-            language = detected_lang if detected_lang else 'en'
-        
-        # Translate input if not in English
-        if language != 'en':
-            user_input = translate_text(user_input, language, 'en')
         
-        # Process with ML models
-        domain = classify(user_input)
-        entities = extract_entities(user_input)
-        answer = answer_question(user_input, domain)
-        legal_references = get_legal_references(domain)
+        # Repeated questions are answered from the result cache without
+        # running language detection or any model stage
+        result = analyze_request(user_input, request.form.get('language', 'en'))
+        language = result['language']
         
-        # Search legal database for additional information
-        database_results = search_legal_database(domain, user_input)
-        
-        # Extract entity texts for display
-        entity_texts = get_entity_texts(entities)
-        
-        # Translate back to original language if needed
-        if language != 'en':
-            answer = translate_text(answer, 'en', language)
-            legal_references = [translate_text(ref, 'en', language) for ref in legal_references]
-        
-        return render_template('result.html', 
-                             answer=answer, 
-                             entities=entity_texts,
-                             domain=domain,
-                             legal_references=legal_references,
-                             user_input=user_input,
-                             database_results=database_results,
-                             language=language)
+        with stage_timer('render_template'):
+            return render_template('result.html', 
+                                 answer=result['answer'], 
+                                 entities=result['entities'],
+                                 domain=result['domain'],
+                                 legal_references=result['legal_references'],
+                                 user_input=result['user_input'],
+                                 database_results=result['database_results'],
+                                 language=language)
     return render_template('index.html')
 
 @app.route('/chatbot')
@@ -82,14 +124,8 @@ def chat():
     message = data.get('message', '')
     session_id = data.get('session_id', 'default')
     
-    # Initialize chatbot if not exists
-    if session_id not in chatbot_instances:
-        chatbot_instances[session_id] = LegalChatbot()
-    
-    chatbot = chatbot_instances[session_id]
-    
     # Get response from chatbot
-    response = chatbot.get_response(message, session_id)
+    response = legal_chatbot.get_response(message, session_id)
     
     return jsonify({
         'response': response['message'],
@@ -103,12 +139,15 @@ def clear_chat():
     data = request.get_json()
     session_id = data.get('session_id', 'default')
     
-    if session_id in chatbot_instances:
-        chatbot_instances[session_id].clear_conversation(session_id)
-        del chatbot_instances[session_id]
+    legal_chatbot.clear_conversation(session_id)
     
     return jsonify({'success': True})
 
+@app.route('/chat-stats')
+def chat_stats():
+    """Chatbot session backend counters"""
+    return jsonify(legal_chatbot.backend.stats())
+
 @app.route('/upload', methods=['POST'])
 def upload_document():
     if 'file' not in request.files:
@@ -123,15 +162,17 @@ def upload_document():
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(filepath)
         
-        # Process the document
-        extracted_text = process_document(filepath)
+        # Process the document in a worker process
+        result = extraction_pool.extract(filepath)
         
         # Clean up uploaded file
         os.remove(filepath)
         
         return jsonify({
             'success': True,
-            'extracted_text': extracted_text
+            'extracted_text': result['text'],
+            'partial': not result['complete'],
+            'error': result['error']
         })
     
     return jsonify({'error': 'Invalid file type'}), 400
@@ -153,6 +194,44 @@ def get_stats():
     stats = get_feedback_stats()
     return jsonify(stats)
 
+@app.route('/classifier-stats')
+def classifier_stats():
+    """Classifier backend and micro-batching counters"""
+    return jsonify(get_classifier_stats())
+
+@app.route('/cache-stats')
+def cache_stats():
+    """Result cache counters"""
+    return jsonify(get_result_cache_stats())
+
+@app.route('/metrics')
+def metrics():
+    """Per-stage latency histograms and counters in Prometheus text format"""
+    if not app.config['METRICS_ENABLED']:
+        return Response('Metrics are disabled\n', status=404, mimetype='text/plain')
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze_api():
+    """Run the analysis pipeline over a batch of questions"""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': "Request body must be a JSON object with an 'inputs' list"}), 400
+    inputs = data.get('inputs')
+    if not isinstance(inputs, list):
+        return jsonify({'error': "'inputs' must be a list"}), 400
+    if len(inputs) > app.config['MAX_BATCH_SIZE']:
+        return jsonify({'error': f"At most {app.config['MAX_BATCH_SIZE']} inputs per request"}), 400
+    
+    default_language = data.get('language')
+    
+    if data.get('stream'):
+        # One JSON result per line, sent as each item completes
+        lines = (json.dumps(result) + '\n' for result in iter_analyze_batch(inputs, default_language))
+        return Response(lines, mimetype='application/x-ndjson')
+    
+    return jsonify({'results': analyze_batch(inputs, default_language)})
+
 @app.route('/api/translate', methods=['POST'])
 def translate_api():
     data = request.get_json()
@@ -0,0 +1,147 @@
+"""Async serving mode for the legal rights interpreter.
+
+/chat, /upload, /api/translate and /feedback run as Quart coroutines; the
+blocking work behind them (chatbot, document extraction, translation,
+SQLite writes, upload file I/O) runs on a thread pool so the event loop
+only ever waits. Every other route is served by the Flask app in app.py
+through an ASGI adapter, so the two share config, models and state.
+
+Run with:
+
+    python asgi.py
+    hypercorn asgi:application --bind 0.0.0.0:8000
+"""
+
+import asyncio
+import functools
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import Flask
+from quart import Quart, jsonify, request
+from werkzeug.utils import secure_filename
+
+from app import app as flask_app, allowed_file, extraction_pool, legal_chatbot
+from models.feedback import save_feedback
+from models.translator import translate_text
+
+# Threads running blocking calls for the async routes
+flask_app.config['ASYNC_WORKERS'] = int(os.environ.get('ASYNC_WORKERS', 32))
+# Address the built-in entry point listens on
+flask_app.config['ASGI_BIND'] = os.environ.get('ASGI_BIND', '127.0.0.1:8000')
+
+# Paths answered by the async app; everything else goes to Flask
+ASYNC_PATHS = frozenset(['/chat', '/upload', '/api/translate', '/feedback'])
+
+executor = ThreadPoolExecutor(max_workers=flask_app.config['ASYNC_WORKERS'], thread_name_prefix='async-worker')
+
+# Flask settings that mean the same on Quart; without MAX_CONTENT_LENGTH
+# Quart would cap request bodies at 16 MiB while Flask has no limit
+SHARED_FLASK_CONFIG = ('MAX_CONTENT_LENGTH', 'SECRET_KEY', 'DEBUG', 'TESTING')
+
+async_app = Quart(__name__)
+# The async routes run with the Flask app's limits and its own settings
+async_app.config.update({
+    key: value for key, value in flask_app.config.items()
+    if key in SHARED_FLASK_CONFIG or key not in Flask.default_config
+})
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the worker pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+def _save_upload(stream, filepath: str):
+    with open(filepath, 'wb') as f:
+        shutil.copyfileobj(stream, f)
+
+@async_app.route('/chat', methods=['POST'])
+async def chat():
+    """Handle chatbot conversations"""
+    data = await request.get_json()
+    message = data.get('message', '')
+    session_id = data.get('session_id', 'default')
+
+    # Get response from chatbot
+    response = await run_blocking(legal_chatbot.get_response, message, session_id)
+
+    return jsonify({
+        'response': response['message'],
+        'suggestions': response.get('suggestions', []),
+        'session_id': session_id
+    })
+
+@async_app.route('/upload', methods=['POST'])
+async def upload_document():
+    files = await request.files
+    if 'file' not in files:
+        return jsonify({'error': 'No file uploaded'}), 400
+
+    file = files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+
+    if file and allowed_file(file.filename):
+        filename = secure_filename(file.filename)
+        filepath = os.path.join(flask_app.config['UPLOAD_FOLDER'], filename)
+        await run_blocking(_save_upload, file.stream, filepath)
+
+        try:
+            # Process the document in a worker process
+            result = await run_blocking(extraction_pool.extract, filepath)
+        finally:
+            # Clean up uploaded file
+            await run_blocking(os.remove, filepath)
+
+        return jsonify({
+            'success': True,
+            'extracted_text': result['text'],
+            'partial': not result['complete'],
+            'error': result['error']
+        })
+
+    return jsonify({'error': 'Invalid file type'}), 400
+
+@async_app.route('/feedback', methods=['POST'])
+async def submit_feedback():
+    data = await request.get_json()
+    question = data.get('question', '')
+    answer = data.get('answer', '')
+    rating = data.get('rating', 0)
+    feedback_text = data.get('feedback_text', '')
+
+    await run_blocking(save_feedback, question, answer, rating, feedback_text)
+
+    return jsonify({'success': True})
+
+@async_app.route('/api/translate', methods=['POST'])
+async def translate_api():
+    data = await request.get_json()
+    text = data.get('text', '')
+    target_lang = data.get('target_lang', 'en')
+
+    translated_text = await run_blocking(translate_text, text, 'en', target_lang)
+    return jsonify({'translated_text': translated_text})
+
+@async_app.after_serving
+async def shutdown_executor():
+    executor.shutdown(wait=False)
+
+wsgi_app = WsgiToAsgi(flask_app)
+
+async def application(scope, receive, send):
+    """ASGI entry point: async routes on Quart, the rest on the Flask app"""
+    if scope['type'] == 'lifespan' or scope.get('path') in ASYNC_PATHS:
+        await async_app(scope, receive, send)
+    else:
+        await wsgi_app(scope, receive, send)
+
+if __name__ == '__main__':
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = [flask_app.config['ASGI_BIND']]
+    asyncio.run(serve(application, config))
@@ -0,0 +1,65 @@
+# models/analysis.py
+
+import re
+from typing import Any, Callable, FrozenSet, List, Union
+
+_TOKEN_PATTERN = re.compile(r"\w+(?:[-']\w+)*")
+
+def tokenize(text_lower: str) -> List[str]:
+    """Split already-lowercased text into word tokens"""
+    return _TOKEN_PATTERN.findall(text_lower)
+
+class cached_property:
+    """Compute an attribute on first access and store it on the instance.
+
+    Like functools.cached_property, but without the per-class lock that
+    Python before 3.12 takes on every first access.
+    """
+
+    def __init__(self, func: Callable[[Any], Any]):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+class AnalysisContext:
+    """Per-request view of the user's input shared by every analysis stage.
+
+    Each derived form is computed on first use and then reused, so the
+    classifier, NER, QA and database search stages do not each lowercase and
+    scan the same text again.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return tokenize(self.lower)
+
+    @cached_property
+    def token_set(self) -> FrozenSet[str]:
+        return frozenset(self.tokens)
+
+    @cached_property
+    def keyword_hits(self) -> FrozenSet[str]:
+        """Legal domain keywords found in the text"""
+        from .classifier import match_keywords
+        return match_keywords(self)
+
+TextInput = Union[str, AnalysisContext]
+
+def as_context(text: TextInput) -> AnalysisContext:
+    """Wrap plain strings so stages can accept either a string or a context"""
+    if isinstance(text, AnalysisContext):
+        return text
+    return AnalysisContext(text)
@@ -0,0 +1,145 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Upper bounds of the batch-size histogram buckets; larger batches go in "+Inf"
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# Put on the queue to stop the worker thread
+_STOP = object()
+
+class MicroBatcher:
+    """Collects concurrent single-item calls into batches for one batch function.
+
+    Callers submit items from any thread and get a Future back. A worker
+    thread takes the first waiting item, keeps collecting until the batch
+    has ``max_batch_size`` items or ``max_wait_ms`` has passed, then calls
+    ``predict_batch_fn(items)`` once and resolves every caller's future with
+    its own result. Under light load a call waits at most ``max_wait_ms``;
+    under heavy load batches fill up and throughput follows the batch size.
+    """
+
+    def __init__(self, predict_batch_fn: Callable[[List[Any]], Sequence[Any]],
+                 max_batch_size: int = 32, max_wait_ms: float = 2.0, name: str = 'micro-batcher'):
+        self.predict_batch_fn = predict_batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+        self.batch_sizes = dict.fromkeys([str(bound) for bound in BATCH_SIZE_BUCKETS] + ["+Inf"], 0)
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item and return a future for its result"""
+        future = Future()
+        # Checking for close and queueing happen together, so no item can
+        # land behind the stop marker
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+            self._queue.put((item, future))
+            depth = self._queue.qsize()
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+        return future
+
+    def predict(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Submit one item and wait for its result"""
+        return self.submit(item).result(timeout)
+
+    def _collect(self, first) -> List:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                # Finish this batch first, then stop
+                self._queue.put(_STOP)
+                break
+            batch.append(entry)
+        return batch
+
+    def _record(self, size: int):
+        for bound in BATCH_SIZE_BUCKETS:
+            if size <= bound:
+                self.batch_sizes[str(bound)] += 1
+                break
+        else:
+            self.batch_sizes["+Inf"] += 1
+        self.batches += 1
+        self.items += size
+
+    def _fail_remaining(self):
+        """Fail anything still queued once stopped, so no caller waits forever"""
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if entry is not _STOP and entry[1].set_running_or_notify_cancel():
+                entry[1].set_exception(RuntimeError("MicroBatcher is closed"))
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                self._fail_remaining()
+                return
+            batch = self._collect(entry)
+            # Skip callers that gave up (cancelled) before the batch ran
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            self._record(len(batch))
+
+            try:
+                results = self.predict_batch_fn([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError(f"Batch function returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                self.errors += 1
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def close(self):
+        """Stop the worker after the items already queued have been served"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._worker is not None:
+                self._queue.put(_STOP)
+
+    def stats(self) -> Dict:
+        """Queue depth and batch-size histogram for monitoring"""
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": self.batches,
+            "items": self.items,
+            "errors": self.errors,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "batch_size_histogram": dict(self.batch_sizes)
+        }
@@ -0,0 +1,301 @@
+import itertools
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .session_store import SessionStore
+
+# Default number of history entries (user and bot messages) kept per session
+DEFAULT_HISTORY_DEPTH = 50
+
+# Expired rows are purged from the SQLite backend once every this many saves
+SQLITE_PURGE_INTERVAL = 1000
+
+# One history entry: (role, text, unix timestamp)
+Turn = Tuple[str, str, float]
+
+class SessionState:
+    """Compact per-session conversation state.
+
+    History is a fixed-capacity ring buffer of (role, text, timestamp)
+    tuples; the oldest entries are dropped once it is full.
+    """
+
+    __slots__ = ("primary_issue", "issue_identified", "history")
+
+    def __init__(self, primary_issue: Optional[str] = None, issue_identified: bool = False,
+                 history: Optional[Iterable[Turn]] = None, history_depth: int = DEFAULT_HISTORY_DEPTH):
+        self.primary_issue = primary_issue
+        self.issue_identified = issue_identified
+        self.history: Deque[Turn] = deque(history or (), maxlen=history_depth)
+
+    def add_turn(self, role: str, text: str):
+        self.history.append((role, text, time.time()))
+
+    def resize_history(self, history_depth: int):
+        """Change the history capacity, keeping the most recent entries"""
+        if self.history.maxlen != history_depth:
+            self.history = deque(self.history, maxlen=history_depth)
+
+    def history_dicts(self) -> List[Dict]:
+        """History in the public shape: [{role: text, 'timestamp': iso}, ...]"""
+        return [
+            {role: text, 'timestamp': datetime.fromtimestamp(timestamp).isoformat()}
+            for role, text, timestamp in self.history
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            "primary_issue": self.primary_issue,
+            "issue_identified": self.issue_identified,
+            "history": list(self.history)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SessionState":
+        history = [_decode_turn(turn) for turn in data.get("history") or ()]
+        return cls(data.get("primary_issue"), data.get("issue_identified", False), history)
+
+def _decode_turn(turn) -> Turn:
+    if isinstance(turn, dict):
+        # Entries saved before history was compacted
+        role = 'user' if 'user' in turn else 'bot'
+        return (role, turn[role], datetime.fromisoformat(turn['timestamp']).timestamp())
+    role, text, timestamp = turn
+    return (role, text, timestamp)
+
+def encode_state(state: SessionState) -> str:
+    return json.dumps(state.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+def decode_state(payload) -> SessionState:
+    return SessionState.from_dict(json.loads(payload))
+
+class SessionBackend(ABC):
+    """Where chatbot session state lives between requests.
+
+    Backends other than the in-memory one are shared by every worker process
+    (and node), so /chat no longer needs sticky sessions.
+    """
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[SessionState]:
+        """The saved state of a session, or None if it is unknown or expired"""
+
+    @abstractmethod
+    def save(self, session_id: str, state: SessionState):
+        """Store a session's state, restarting its expiry"""
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        """Forget a session"""
+
+    def stats(self) -> Dict:
+        return {"backend": type(self).__name__}
+
+class MemorySessionBackend(SessionBackend):
+    """Per-process backend on top of a bounded LRU/TTL SessionStore"""
+
+    def __init__(self, store: Optional[SessionStore] = None):
+        self.store = store if store is not None else SessionStore()
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        return self.store.get(session_id)
+
+    def save(self, session_id: str, state: SessionState):
+        self.store.set(session_id, state)
+
+    def delete(self, session_id: str):
+        self.store.pop(session_id)
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        stats.update(self.store.stats())
+        return stats
+
+class SqliteSessionBackend(SessionBackend):
+    """Backend in a local SQLite file, shared by every worker on the machine.
+
+    Expired sessions are dropped when loaded, and every ``purge_interval``
+    saves all expired rows are deleted so abandoned sessions do not pile up.
+    """
+
+    def __init__(self, path: str = 'data/chat_sessions.db', ttl: Optional[float] = 1800.0,
+                 purge_interval: int = SQLITE_PURGE_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._saves = itertools.count(1)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS chat_sessions ('
+                'session_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS chat_sessions_updated ON chat_sessions (updated)')
+            connection.commit()
+            self._local.connection = connection
+        return connection
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        row = self._connection().execute(
+            'SELECT state, updated FROM chat_sessions WHERE session_id = ?', (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        if self.ttl is not None and time.time() - row[1] >= self.ttl:
+            self.delete(session_id)
+            return None
+        return decode_state(row[0])
+
+    def save(self, session_id: str, state: SessionState):
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO chat_sessions (session_id, state, updated) VALUES (?, ?, ?)',
+                (session_id, encode_state(state), time.time())
+            )
+        if self.ttl is not None and self.purge_interval > 0 and next(self._saves) % self.purge_interval == 0:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete every expired session and return how many were removed"""
+        if self.ttl is None:
+            return 0
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute('DELETE FROM chat_sessions WHERE updated <= ?', (time.time() - self.ttl,))
+        return cursor.rowcount
+
+    def delete(self, session_id: str):
+        connection = self._connection()
+        with connection:
+            connection.execute('DELETE FROM chat_sessions WHERE session_id = ?', (session_id,))
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+class RedisSessionBackend(SessionBackend):
+    """Backend speaking the Redis protocol (RESP) to any compatible server.
+
+    Only GET, SET with EX and DEL are used, so it also works against local
+    stand-ins for Redis. Each thread keeps its own connection.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0, password: Optional[str] = None,
+                 ttl: Optional[float] = 1800.0, key_prefix: str = 'chat-session:', timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        self._local.sock = sock
+        self._local.reader = sock.makefile('rb')
+        try:
+            if self.password:
+                self._send('AUTH', self.password)
+            if self.db:
+                self._send('SELECT', self.db)
+        except Exception:
+            # Never keep a connection that is not authenticated or on the wrong db
+            self._local.sock = None
+            sock.close()
+            raise
+
+    def _send(self, *args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        self._local.sock.sendall(b''.join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._local.reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b'+':
+            return body.decode('utf-8')
+        if prefix == b'-':
+            raise RedisError(body.decode('utf-8'))
+        if prefix == b':':
+            return int(body)
+        if prefix == b'$':
+            length = int(body)
+            if length == -1:
+                return None
+            return self._local.reader.read(length + 2)[:-2]
+        if prefix == b'*':
+            length = int(body)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def execute(self, *args):
+        """Run one command, reconnecting once if the connection was dropped"""
+        for attempt in range(2):
+            if getattr(self._local, 'sock', None) is None:
+                self._connect()
+            try:
+                return self._send(*args)
+            except (ConnectionError, OSError):
+                self._local.sock.close()
+                self._local.sock = None
+                if attempt:
+                    raise
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        payload = self.execute('GET', self.key_prefix + session_id)
+        return None if payload is None else decode_state(payload)
+
+    def save(self, session_id: str, state: SessionState):
+        if self.ttl is None:
+            self.execute('SET', self.key_prefix + session_id, encode_state(state))
+        else:
+            self.execute('SET', self.key_prefix + session_id, encode_state(state), 'EX', max(1, int(self.ttl)))
+
+    def delete(self, session_id: str):
+        self.execute('DEL', self.key_prefix + session_id)
+
+def create_session_backend(url: str = 'memory://', capacity: int = 10000, ttl: Optional[float] = 1800.0) -> SessionBackend:
+    """Build a session backend from a URL.
+
+    ``memory://`` keeps sessions in this process, ``sqlite:///path/to.db``
+    shares them between processes on one machine and
+    ``redis://[:password@]host[:port][/db]`` shares them across nodes.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == 'memory':
+        return MemorySessionBackend(SessionStore(capacity, ttl))
+    if parsed.scheme == 'sqlite':
+        # sqlite:///relative/path.db and sqlite:////absolute/path.db
+        return SqliteSessionBackend(parsed.path[1:] or 'data/chat_sessions.db', ttl)
+    if parsed.scheme == 'redis':
+        db = parsed.path.lstrip('/')
+        return RedisSessionBackend(parsed.hostname or 'localhost', parsed.port or 6379, int(db) if db else 0,
+                                   parsed.password, ttl)
+    raise ValueError(f"Unsupported session backend: {url}")
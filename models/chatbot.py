@@ -1,160 +1,181 @@
 import json
 from typing import Dict, List, Optional
-from datetime import datetime
+
+from .chat_sessions import DEFAULT_HISTORY_DEPTH, MemorySessionBackend, SessionBackend, SessionState
+from .intent_router import IntentRouter
+from .metrics import timed
+from .utils import freeze
+
+# Predefined conversation flows
+CONVERSATION_FLOWS = freeze({
+    "greeting": {
+        "triggers": ["hello", "hi", "hey", "start", "begin"],
+        "response": "Hello! I'm your AI Legal Assistant. I can help you understand your legal rights and provide guidance on various legal matters. What legal situation would you like to discuss today?",
+        "suggestions": [
+            "I was arrested",
+            "I was fired from my job",
+            "My landlord is evicting me",
+            "I'm going through a divorce",
+            "I have a contract dispute"
+        ]
+    },
+    "arrest": {
+        "triggers": ["arrested", "arrest", "police", "charged", "criminal"],
+        "response": "I understand you're dealing with a criminal law situation. This is serious and you have important rights. Let me help you understand what you should do.",
+        "follow_up": "Can you tell me more about your situation? For example:\n- When were you arrested?\n- What were you charged with?\n- Do you have a lawyer?\n- Are you currently in custody?",
+        "suggestions": [
+            "What are my rights when arrested?",
+            "How do I get a lawyer?",
+            "What should I say to the police?",
+            "How do I post bail?"
+        ]
+    },
+    "employment": {
+        "triggers": ["fired", "terminated", "laid off", "job", "work", "employment", "discrimination", "harassment"],
+        "response": "I see you're dealing with an employment law issue. This can be stressful, but you have rights as an employee. Let me help you understand your situation.",
+        "follow_up": "To better assist you, I need to know:\n- Why were you terminated?\n- Did you receive any written notice?\n- Were there any warning signs?\n- Do you have documentation?",
+        "suggestions": [
+            "What are my rights when fired?",
+            "How do I file for unemployment?",
+            "Can I sue for wrongful termination?",
+            "What is workplace discrimination?"
+        ]
+    },
+    "housing": {
+        "triggers": ["eviction", "evicted", "landlord", "rent", "lease", "apartment", "house"],
+        "response": "I understand you're facing a housing law issue. Tenant rights are important and there are legal protections in place. Let me help you understand your rights.",
+        "follow_up": "To provide better guidance, please tell me:\n- What type of notice did you receive?\n- How long have you lived there?\n- Are you behind on rent?\n- Are there any habitability issues?",
+        "suggestions": [
+            "What are my tenant rights?",
+            "How do I fight an eviction?",
+            "Can I withhold rent for repairs?",
+            "What is a security deposit dispute?"
+        ]
+    },
+    "family": {
+        "triggers": ["divorce", "custody", "child", "marriage", "spouse", "alimony"],
+        "response": "I understand you're dealing with a family law matter. These situations can be emotionally challenging, but understanding your legal rights is important.",
+        "follow_up": "To help you better, I need to know:\n- Are you married or in a domestic partnership?\n- Do you have children together?\n- Have you already filed for divorce?\n- Are there custody concerns?",
+        "suggestions": [
+            "How do I file for divorce?",
+            "What are my custody rights?",
+            "How is child support calculated?",
+            "What is the divorce process?"
+        ]
+    },
+    "contract": {
+        "triggers": ["contract", "agreement", "breach", "lawsuit", "damages", "settlement"],
+        "response": "I see you're dealing with a contract or civil law issue. Understanding your legal options is crucial in these situations.",
+        "follow_up": "To provide specific guidance, please tell me:\n- What type of contract is involved?\n- What was the breach?\n- Do you have evidence?\n- What damages are you seeking?",
+        "suggestions": [
+            "How do I sue for breach of contract?",
+            "What evidence do I need?",
+            "Should I hire a lawyer?",
+            "What are my damages?"
+        ]
+    }
+})
+
+# Quick responses for common questions
+QUICK_RESPONSES = freeze({
+    "rights": {
+        "arrest": "When arrested, you have the right to:\n• Remain silent\n• Speak to a lawyer\n• Be informed of charges\n• A speedy trial\n• Protection from unreasonable searches",
+        "employment": "As an employee, you have the right to:\n• Minimum wage and overtime\n• Safe working conditions\n• Protection from discrimination\n• Family and medical leave\n• Workers' compensation",
+        "housing": "As a tenant, you have the right to:\n• Habitable living conditions\n• Privacy in your home\n• Proper notice before eviction\n• Return of security deposit\n• Fair housing without discrimination"
+    },
+    "immediate_actions": {
+        "arrest": "If arrested:\n1. Stay calm and don't resist\n2. Say 'I want to speak to my lawyer'\n3. Don't answer questions without counsel\n4. Don't consent to searches\n5. Contact family/friends",
+        "fired": "If fired:\n1. Request written termination letter\n2. Collect all documents\n3. File for unemployment immediately\n4. Contact Department of Labor\n5. Consider legal consultation",
+        "eviction": "If facing eviction:\n1. Review the eviction notice carefully\n2. Contact legal aid immediately\n3. Don't move out without legal advice\n4. Document all communications\n5. Consider negotiating with landlord"
+    }
+})
+
+# Intents in priority order: the greeting, then each legal flow, then
+# general questions. "do" and "now" must both appear for immediate actions.
+INTENT_ROUTER = IntentRouter(
+    [(flow_key, [flow_data["triggers"]]) for flow_key, flow_data in CONVERSATION_FLOWS.items()] + [
+        ("rights", [["right", "rights"]]),
+        ("immediate_actions", [["do"], ["now"]]),
+        ("lawyer", [["lawyer", "attorney"]]),
+        ("cost", [["cost", "money", "expensive"]]),
+        ("timing", [["time", "long"]])
+    ]
+)
 
 class LegalChatbot:
-    def __init__(self):
-        self.conversation_history = {}
-        self.user_context = {}
-        
-        # Predefined conversation flows
-        self.conversation_flows = {
-            "greeting": {
-                "triggers": ["hello", "hi", "hey", "start", "begin"],
-                "response": "Hello! I'm your AI Legal Assistant. I can help you understand your legal rights and provide guidance on various legal matters. What legal situation would you like to discuss today?",
-                "suggestions": [
-                    "I was arrested",
-                    "I was fired from my job",
-                    "My landlord is evicting me",
-                    "I'm going through a divorce",
-                    "I have a contract dispute"
-                ]
-            },
-            "arrest": {
-                "triggers": ["arrested", "arrest", "police", "charged", "criminal"],
-                "response": "I understand you're dealing with a criminal law situation. This is serious and you have important rights. Let me help you understand what you should do.",
-                "follow_up": "Can you tell me more about your situation? For example:\n- When were you arrested?\n- What were you charged with?\n- Do you have a lawyer?\n- Are you currently in custody?",
-                "suggestions": [
-                    "What are my rights when arrested?",
-                    "How do I get a lawyer?",
-                    "What should I say to the police?",
-                    "How do I post bail?"
-                ]
-            },
-            "employment": {
-                "triggers": ["fired", "terminated", "laid off", "job", "work", "employment", "discrimination", "harassment"],
-                "response": "I see you're dealing with an employment law issue. This can be stressful, but you have rights as an employee. Let me help you understand your situation.",
-                "follow_up": "To better assist you, I need to know:\n- Why were you terminated?\n- Did you receive any written notice?\n- Were there any warning signs?\n- Do you have documentation?",
-                "suggestions": [
-                    "What are my rights when fired?",
-                    "How do I file for unemployment?",
-                    "Can I sue for wrongful termination?",
-                    "What is workplace discrimination?"
-                ]
-            },
-            "housing": {
-                "triggers": ["eviction", "evicted", "landlord", "rent", "lease", "apartment", "house"],
-                "response": "I understand you're facing a housing law issue. Tenant rights are important and there are legal protections in place. Let me help you understand your rights.",
-                "follow_up": "To provide better guidance, please tell me:\n- What type of notice did you receive?\n- How long have you lived there?\n- Are you behind on rent?\n- Are there any habitability issues?",
-                "suggestions": [
-                    "What are my tenant rights?",
-                    "How do I fight an eviction?",
-                    "Can I withhold rent for repairs?",
-                    "What is a security deposit dispute?"
-                ]
-            },
-            "family": {
-                "triggers": ["divorce", "custody", "child", "marriage", "spouse", "alimony"],
-                "response": "I understand you're dealing with a family law matter. These situations can be emotionally challenging, but understanding your legal rights is important.",
-                "follow_up": "To help you better, I need to know:\n- Are you married or in a domestic partnership?\n- Do you have children together?\n- Have you already filed for divorce?\n- Are there custody concerns?",
-                "suggestions": [
-                    "How do I file for divorce?",
-                    "What are my custody rights?",
-                    "How is child support calculated?",
-                    "What is the divorce process?"
-                ]
-            },
-            "contract": {
-                "triggers": ["contract", "agreement", "breach", "lawsuit", "damages", "settlement"],
-                "response": "I see you're dealing with a contract or civil law issue. Understanding your legal options is crucial in these situations.",
-                "follow_up": "To provide specific guidance, please tell me:\n- What type of contract is involved?\n- What was the breach?\n- Do you have evidence?\n- What damages are you seeking?",
-                "suggestions": [
-                    "How do I sue for breach of contract?",
-                    "What evidence do I need?",
-                    "Should I hire a lawyer?",
-                    "What are my damages?"
-                ]
-            }
-        }
-        
-        # Quick responses for common questions
-        self.quick_responses = {
-            "rights": {
-                "arrest": "When arrested, you have the right to:\n• Remain silent\n• Speak to a lawyer\n• Be informed of charges\n• A speedy trial\n• Protection from unreasonable searches",
-                "employment": "As an employee, you have the right to:\n• Minimum wage and overtime\n• Safe working conditions\n• Protection from discrimination\n• Family and medical leave\n• Workers' compensation",
-                "housing": "As a tenant, you have the right to:\n• Habitable living conditions\n• Privacy in your home\n• Proper notice before eviction\n• Return of security deposit\n• Fair housing without discrimination"
-            },
-            "immediate_actions": {
-                "arrest": "If arrested:\n1. Stay calm and don't resist\n2. Say 'I want to speak to my lawyer'\n3. Don't answer questions without counsel\n4. Don't consent to searches\n5. Contact family/friends",
-                "fired": "If fired:\n1. Request written termination letter\n2. Collect all documents\n3. File for unemployment immediately\n4. Contact Department of Labor\n5. Consider legal consultation",
-                "eviction": "If facing eviction:\n1. Review the eviction notice carefully\n2. Contact legal aid immediately\n3. Don't move out without legal advice\n4. Document all communications\n5. Consider negotiating with landlord"
-            }
-        }
+    # The conversation tables are shared, read-only data
+    conversation_flows = CONVERSATION_FLOWS
+    quick_responses = QUICK_RESPONSES
+    
+    __slots__ = ("backend", "history_depth")
+    
+    def __init__(self, backend: Optional[SessionBackend] = None, history_depth: int = DEFAULT_HISTORY_DEPTH):
+        self.backend = backend if backend is not None else MemorySessionBackend()
+        self.history_depth = history_depth
 
+    @timed('chat_response')
     def get_response(self, message: str, session_id: str) -> Dict:
         """Generate a response based on the user's message and conversation context"""
         
-        # Initialize session if not exists
-        if session_id not in self.conversation_history:
-            self.conversation_history[session_id] = []
-            self.user_context[session_id] = {}
+        # Load the session, initializing it if it does not exist
+        state = self.backend.load(session_id)
+        if state is None:
+            state = SessionState(history_depth=self.history_depth)
+        else:
+            state.resize_history(self.history_depth)
         
         # Add message to history
-        self.conversation_history[session_id].append({
-            'user': message,
-            'timestamp': datetime.now().isoformat()
-        })
+        state.add_turn('user', message)
         
         # Analyze message and determine response
-        response = self._analyze_message(message, session_id)
+        response = self._analyze_message(message, state)
         
         # Add response to history
-        self.conversation_history[session_id].append({
-            'bot': response['message'],
-            'timestamp': datetime.now().isoformat()
-        })
+        state.add_turn('bot', response['message'])
         
+        self.backend.save(session_id, state)
         return response
 
-    def _analyze_message(self, message: str, session_id: str) -> Dict:
+    def _analyze_message(self, message: str, state: SessionState) -> Dict:
         """Analyze the message and generate appropriate response"""
-        message_lower = message.lower()
+        route = INTENT_ROUTER.route(message.lower())
+        intent = route.intent if route else None
         
         # Check for greeting
-        if any(word in message_lower for word in self.conversation_flows["greeting"]["triggers"]):
+        if intent == "greeting":
             return {
                 'message': self.conversation_flows["greeting"]["response"],
-                'suggestions': self.conversation_flows["greeting"]["suggestions"]
+                'suggestions': list(self.conversation_flows["greeting"]["suggestions"])
             }
         
         # Check for specific legal situations
-        for flow_key, flow_data in self.conversation_flows.items():
-            if flow_key != "greeting":
-                if any(word in message_lower for word in flow_data["triggers"]):
-                    # Update user context
-                    self.user_context[session_id]['primary_issue'] = flow_key
-                    
-                    # Check if this is a follow-up question
-                    if self.user_context[session_id].get('issue_identified'):
-                        return self._handle_follow_up(message, flow_key, session_id)
-                    else:
-                        self.user_context[session_id]['issue_identified'] = True
-                        return {
-                            'message': flow_data["response"] + "\n\n" + flow_data["follow_up"],
-                            'suggestions': flow_data["suggestions"]
-                        }
+        if intent in self.conversation_flows:
+            flow_data = self.conversation_flows[intent]
+            
+            # Update user context
+            state.primary_issue = intent
+            
+            # Check if this is a follow-up question
+            if state.issue_identified:
+                return self._handle_follow_up(message, intent, state)
+            else:
+                state.issue_identified = True
+                return {
+                    'message': flow_data["response"] + "\n\n" + flow_data["follow_up"],
+                    'suggestions': list(flow_data["suggestions"])
+                }
         
         # Handle specific questions
-        if "right" in message_lower or "rights" in message_lower:
-            return self._handle_rights_question(message, session_id)
-        elif "do" in message_lower and "now" in message_lower:
-            return self._handle_immediate_actions_question(message, session_id)
-        elif "lawyer" in message_lower or "attorney" in message_lower:
-            return self._handle_lawyer_question(message, session_id)
-        elif "cost" in message_lower or "money" in message_lower or "expensive" in message_lower:
-            return self._handle_cost_question(message, session_id)
-        elif "time" in message_lower or "long" in message_lower:
-            return self._handle_timing_question(message, session_id)
+        if intent == "rights":
+            return self._handle_rights_question(message, state)
+        elif intent == "immediate_actions":
+            return self._handle_immediate_actions_question(message, state)
+        elif intent == "lawyer":
+            return self._handle_lawyer_question(message, state)
+        elif intent == "cost":
+            return self._handle_cost_question(message, state)
+        elif intent == "timing":
+            return self._handle_timing_question(message, state)
         
         # Default response
         return {
@@ -168,7 +189,7 @@ class LegalChatbot:
             ]
         }
 
-    def _handle_follow_up(self, message: str, issue_type: str, session_id: str) -> Dict:
+    def _handle_follow_up(self, message: str, issue_type: str, state: SessionState) -> Dict:
         """Handle follow-up questions based on the identified issue"""
         message_lower = message.lower()
         
@@ -214,10 +235,9 @@ class LegalChatbot:
             'suggestions': ["What documents should I gather?", "How do I find legal help?", "What are my next steps?"]
         }
 
-    def _handle_rights_question(self, message: str, session_id: str) -> Dict:
+    def _handle_rights_question(self, message: str, state: SessionState) -> Dict:
         """Handle questions about legal rights"""
-        context = self.user_context.get(session_id, {})
-        issue = context.get('primary_issue')
+        issue = state.primary_issue
         
         if issue in self.quick_responses["rights"]:
             return {
@@ -230,10 +250,9 @@ class LegalChatbot:
             'suggestions': ["I was arrested", "I was fired", "I'm being evicted", "I'm getting divorced"]
         }
 
-    def _handle_immediate_actions_question(self, message: str, session_id: str) -> Dict:
+    def _handle_immediate_actions_question(self, message: str, state: SessionState) -> Dict:
         """Handle questions about immediate actions"""
-        context = self.user_context.get(session_id, {})
-        issue = context.get('primary_issue')
+        issue = state.primary_issue
         
         if issue in self.quick_responses["immediate_actions"]:
             return {
@@ -246,21 +265,21 @@ class LegalChatbot:
             'suggestions': ["I was just arrested", "I was just fired", "I just received an eviction notice"]
         }
 
-    def _handle_lawyer_question(self, message: str, session_id: str) -> Dict:
+    def _handle_lawyer_question(self, message: str, state: SessionState) -> Dict:
         """Handle questions about finding lawyers"""
         return {
             'message': "Finding the right lawyer is crucial. Here are your options:\n\n**Free/Low-Cost Options:**\n• Legal Aid organizations\n• Pro bono services\n• Public defenders (criminal cases)\n• Law school clinics\n\n**Private Attorneys:**\n• Bar association referrals\n• Online legal directories\n• Personal recommendations\n• Specialized legal organizations\n\n**Questions to Ask:**\n• Experience with your type of case\n• Fee structure and costs\n• Communication style\n• Success rate\n\nAlways consult multiple attorneys before choosing.",
             'suggestions': ["How do I know if a lawyer is good?", "What questions should I ask?", "How much will it cost?"]
         }
 
-    def _handle_cost_question(self, message: str, session_id: str) -> Dict:
+    def _handle_cost_question(self, message: str, state: SessionState) -> Dict:
         """Handle questions about legal costs"""
         return {
             'message': "Legal costs vary widely depending on your situation:\n\n**Free Options:**\n• Legal Aid (income-based)\n• Pro bono services\n• Public defenders\n• Self-help resources\n\n**Low-Cost Options:**\n• Payment plans\n• Contingency fees (personal injury)\n• Flat fees for simple matters\n• Legal insurance\n\n**Cost Factors:**\n• Case complexity\n• Attorney experience\n• Geographic location\n• Time required\n\nDon't let cost prevent you from getting legal help - many options exist for different budgets.",
             'suggestions': ["How do I find free legal help?", "What are payment plans?", "Is legal aid available?"]
         }
 
-    def _handle_timing_question(self, message: str, session_id: str) -> Dict:
+    def _handle_timing_question(self, message: str, state: SessionState) -> Dict:
         """Handle questions about legal timing"""
         return {
             'message': "Legal timing is critical and varies by situation:\n\n**Immediate (Same Day):**\n• Criminal arrests\n• Emergency evictions\n• Workplace safety issues\n\n**Within Days:**\n• Employment discrimination\n• Contract disputes\n• Family law emergencies\n\n**Within Weeks:**\n• Most civil lawsuits\n• Administrative complaints\n• Standard legal filings\n\n**Important:** Many legal claims have strict deadlines (statutes of limitations). Acting quickly often improves your chances of success and preserves your rights.",
@@ -269,11 +288,9 @@ class LegalChatbot:
 
     def get_conversation_history(self, session_id: str) -> List[Dict]:
         """Get conversation history for a session"""
-        return self.conversation_history.get(session_id, [])
+        state = self.backend.load(session_id)
+        return state.history_dicts() if state else []
 
     def clear_conversation(self, session_id: str):
         """Clear conversation history for a session"""
-        if session_id in self.conversation_history:
-            del self.conversation_history[session_id]
-        if session_id in self.user_context:
-            del self.user_context[session_id] 
\ No newline at end of file
+        self.backend.delete(session_id)
@@ -1,7 +1,10 @@
 # models/classifier.py
 
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-import torch
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+from .analysis import AnalysisContext, TextInput, as_context, tokenize
 
 # Initialize the classifier pipeline
 classifier = None
@@ -11,6 +14,10 @@ model = None
 def initialize_classifier():
     global classifier, tokenizer, model
     try:
+        # transformers/torch cost seconds and hundreds of MB to import, so they
+        # are only loaded when a model is actually wanted
+        from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+        
         # Use a pre-trained model for text classification
         model_name = "microsoft/DialoGPT-medium"  # We'll use this as base and fine-tune for legal domains
         tokenizer = AutoTokenizer.from_pretrained(model_name)
@@ -26,73 +33,254 @@ def initialize_classifier():
         # Fallback to rule-based classification
         classifier = None
 
-def classify(text):
-    """Classify legal text into domains using enhanced keyword-based approach"""
-    
-    # Enhanced legal domain keywords and patterns
-    domain_keywords = {
-        "Labor Law": [
-            "employment", "work", "job", "fired", "terminated", "laid off", "employer", "employee", 
-            "boss", "manager", "wage", "salary", "pay", "overtime", "discrimination", "harassment", 
-            "workplace", "union", "contract", "performance review", "promotion", "demotion", 
-            "hostile work environment", "retaliation", "whistleblower", "workers compensation", 
-            "unemployment", "severance", "notice period", "at-will employment", "wrongful termination"
-        ],
-        "Criminal Law": [
-            "arrest", "arrested", "police", "crime", "criminal", "charges", "bail", "trial", 
-            "conviction", "sentence", "prison", "jail", "probation", "parole", "guilty", "innocent", 
-            "defendant", "prosecutor", "district attorney", "public defender", "plea bargain", 
-            "misdemeanor", "felony", "indictment", "arraignment", "preliminary hearing", 
-            "grand jury", "search warrant", "miranda rights", "right to counsel", "due process"
-        ],
-        "Civil Law": [
-            "contract", "agreement", "breach", "damages", "compensation", "liability", "negligence", 
-            "tort", "lawsuit", "settlement", "plaintiff", "defendant", "court", "judge", "jury", 
-            "evidence", "testimony", "deposition", "discovery", "motion", "appeal", "verdict", 
-            "judgment", "injunction", "specific performance", "restitution", "punitive damages"
-        ],
-        "Family Law": [
-            "divorce", "divorced", "custody", "child support", "alimony", "spousal support", 
-            "marriage", "adoption", "prenuptial", "prenup", "visitation", "guardianship", 
-            "spouse", "ex-spouse", "children", "parenting", "paternity", "maternity", 
-            "domestic violence", "restraining order", "protective order", "marital property", 
-            "community property", "separation", "annulment", "paternity test", "adoption"
-        ],
-        "Property Law": [
-            "real estate", "property", "landlord", "tenant", "lease", "rent", "eviction", 
-            "evicted", "ownership", "title", "deed", "mortgage", "house", "apartment", "rental", 
-            "security deposit", "rent increase", "maintenance", "repairs", "habitability", 
-            "quiet enjoyment", "sublease", "assignment", "rent control", "housing discrimination", 
-            "fair housing", "zoning", "easement", "adverse possession", "eminent domain"
-        ]
-    }
-    
-    text_lower = text.lower()
-    
-    # Calculate domain scores based on keyword frequency and context
-    domain_scores = {}
-    for domain, keywords in domain_keywords.items():
-        score = 0
+# Legal domain keywords and patterns
+DOMAIN_KEYWORDS = {
+    "Labor Law": [
+        "employment", "work", "job", "fired", "terminated", "laid off", "employer", "employee", 
+        "boss", "manager", "wage", "salary", "pay", "overtime", "discrimination", "harassment", 
+        "workplace", "union", "contract", "performance review", "promotion", "demotion", 
+        "hostile work environment", "retaliation", "whistleblower", "workers compensation", 
+        "unemployment", "severance", "notice period", "at-will employment", "wrongful termination"
+    ],
+    "Criminal Law": [
+        "arrest", "arrested", "police", "crime", "criminal", "charges", "bail", "trial", 
+        "conviction", "sentence", "prison", "jail", "probation", "parole", "guilty", "innocent", 
+        "defendant", "prosecutor", "district attorney", "public defender", "plea bargain", 
+        "misdemeanor", "felony", "indictment", "arraignment", "preliminary hearing", 
+        "grand jury", "search warrant", "miranda rights", "right to counsel", "due process"
+    ],
+    "Civil Law": [
+        "contract", "agreement", "breach", "damages", "compensation", "liability", "negligence", 
+        "tort", "lawsuit", "settlement", "plaintiff", "defendant", "court", "judge", "jury", 
+        "evidence", "testimony", "deposition", "discovery", "motion", "appeal", "verdict", 
+        "judgment", "injunction", "specific performance", "restitution", "punitive damages"
+    ],
+    "Family Law": [
+        "divorce", "divorced", "custody", "child support", "alimony", "spousal support", 
+        "marriage", "adoption", "prenuptial", "prenup", "visitation", "guardianship", 
+        "spouse", "ex-spouse", "children", "parenting", "paternity", "maternity", 
+        "domestic violence", "restraining order", "protective order", "marital property", 
+        "community property", "separation", "annulment", "paternity test", "adoption"
+    ],
+    "Property Law": [
+        "real estate", "property", "landlord", "tenant", "lease", "rent", "eviction", 
+        "evicted", "ownership", "title", "deed", "mortgage", "house", "apartment", "rental", 
+        "security deposit", "rent increase", "maintenance", "repairs", "habitability", 
+        "quiet enjoyment", "sublease", "assignment", "rent control", "housing discrimination", 
+        "fair housing", "zoning", "easement", "adverse possession", "eminent domain"
+    ]
+}
+
+# Give higher weight to more specific terms
+KEYWORD_WEIGHTS = {
+    "arrested": 3, "fired": 3, "divorce": 3, "eviction": 3,
+    "discrimination": 2, "harassment": 2, "custody": 2, "landlord": 2
+}
+
+def _build_keyword_table():
+    """Precompute each keyword's (domain, weight) contributions.
+
+    A keyword listed twice for a domain is credited twice, as before.
+    """
+    contributions = {}
+    for domain, keywords in DOMAIN_KEYWORDS.items():
         for keyword in keywords:
-            if keyword in text_lower:
-                # Give higher weight to more specific terms
-                if keyword in ["arrested", "fired", "divorce", "eviction"]:
-                    score += 3
-                elif keyword in ["discrimination", "harassment", "custody", "landlord"]:
-                    score += 2
-                else:
-                    score += 1
-        domain_scores[domain] = score
+            contributions.setdefault(keyword, []).append((domain, KEYWORD_WEIGHTS.get(keyword, 1)))
+    return {keyword: tuple(entries) for keyword, entries in contributions.items()}
+
+# keyword -> ((domain, weight), ...) for every distinct keyword
+_KEYWORD_CONTRIBUTIONS = _build_keyword_table()
+
+def _build_first_word_index():
+    """Index the keywords by their first word: {first word: ((keyword, other words), ...)}"""
+    index = {}
+    for keyword in _KEYWORD_CONTRIBUTIONS:
+        words = tokenize(keyword)
+        index.setdefault(words[0], []).append((keyword, tuple(words[1:])))
+    return {word: tuple(entries) for word, entries in index.items()}
+
+_KEYWORDS_BY_FIRST_WORD = _build_first_word_index()
+_FIRST_WORD_LENGTHS = tuple(sorted({len(word) for word in _KEYWORDS_BY_FIRST_WORD}))
+
+_NO_KEYWORDS = (frozenset(), ())
+
+@lru_cache(maxsize=65536)
+def _token_keywords(token: str) -> Tuple[FrozenSet[str], Tuple[Tuple[str, Tuple[str, ...]], ...]]:
+    """Keywords a token starts, as (single-word keywords hit, multi-word keywords to check).
+
+    A keyword word may begin the token or any part of it after a hyphen or
+    apostrophe ("ex-spouse" also starts "spouse"). The last word of a
+    keyword only has to be a prefix of the token, so inflected forms
+    ("landlords", "contracts") count; earlier words must match a whole part.
+    """
+    single, multi = set(), []
+    parts = [token] + [token[i + 1:] for i, char in enumerate(token) if char in "-'"]
+    for part in parts:
+        for length in _FIRST_WORD_LENGTHS:
+            if length > len(part):
+                break
+            for keyword, rest in _KEYWORDS_BY_FIRST_WORD.get(part[:length], ()):
+                if not rest:
+                    single.add(keyword)
+                elif length == len(part):
+                    multi.append((keyword, rest))
+    if not single and not multi:
+        return _NO_KEYWORDS
+    return frozenset(single), tuple(multi)
+
+def _rest_follows(tokens: Sequence[str], start: int, rest: Tuple[str, ...]) -> bool:
+    end = start + len(rest)
+    if end > len(tokens):
+        return False
+    return tuple(tokens[start:end - 1]) == rest[:-1] and tokens[end - 1].startswith(rest[-1])
+
+def match_keywords(context: AnalysisContext) -> FrozenSet[str]:
+    """Return the set of domain keywords found in a text's tokens.
+
+    Each distinct token is looked up once (and memoized across requests);
+    only tokens that begin a multi-word keyword are revisited by position.
+    """
+    hits = set()
+    phrase_starts = {}
+    for token in context.token_set:
+        found = _token_keywords(token)
+        if found is _NO_KEYWORDS:
+            continue
+        single, multi = found
+        hits.update(single)
+        if multi:
+            phrase_starts[token] = multi
+    
+    if phrase_starts:
+        tokens = context.tokens
+        for index, token in enumerate(tokens):
+            for keyword, rest in phrase_starts.get(token, ()):
+                if keyword not in hits and _rest_follows(tokens, index + 1, rest):
+                    hits.add(keyword)
+    return frozenset(hits)
+
+def score_domains(keyword_hits: Iterable[str]) -> Dict[str, int]:
+    """Score every legal domain from a set of matched keywords"""
+    domain_scores = dict.fromkeys(DOMAIN_KEYWORDS, 0)
+    for keyword in keyword_hits:
+        for domain, weight in _KEYWORD_CONTRIBUTIONS[keyword]:
+            domain_scores[domain] += weight
+    return domain_scores
+
+def classify_with_scores(text: TextInput) -> Tuple[str, Dict[str, int]]:
+    """Classify legal text and return the winning domain plus every domain score"""
+    domain_scores = score_domains(as_context(text).keyword_hits)
     
     # Return the domain with highest score
     if max(domain_scores.values()) > 0:
-        return max(domain_scores, key=domain_scores.get)
+        return max(domain_scores, key=domain_scores.get), domain_scores
+    else:
+        return "General Law", domain_scores
+
+# Optional learned backend (see models/learned_classifier.py); None means the
+# keyword classifier above is used
+learned_model = None
+
+# Learned predictions below this probability fall back to the keyword classifier
+learned_min_confidence = 0.0
+
+# Gathers concurrent classify() calls into one model call when a model is used
+classify_batcher = None
+
+# Seconds a classify() call waits for its micro-batch before falling back to keywords
+classify_timeout = 1.0
+
+def configure_classifier(backend: str = 'keywords', model_dir: str = 'data/classifier_model',
+                         min_confidence: float = 0.0, max_batch_size: int = 32, max_wait_ms: float = 2.0,
+                         timeout: float = 1.0):
+    """Select the classification backend: 'keywords' or 'learned'.
+
+    With a model backend, single classify() calls are micro-batched unless
+    max_batch_size is 1 or less; a call whose batch takes longer than
+    ``timeout`` seconds is answered by the keyword classifier.
+    """
+    global learned_model, learned_min_confidence, classify_batcher, classify_timeout
+    if backend == 'keywords':
+        model = None
+    elif backend == 'learned':
+        # numpy/scikit-learn are only imported when the learned backend is used
+        from .learned_classifier import load_learned_classifier
+        model = load_learned_classifier(model_dir)
+        if model is None:
+            print("Falling back to keyword classification")
     else:
-        return "General Law"
+        raise ValueError(f"Unknown classifier backend: {backend}")
+    
+    old_batcher = classify_batcher
+    learned_model = model
+    learned_min_confidence = min_confidence
+    classify_timeout = timeout
+    if model is not None and max_batch_size > 1:
+        from .batching import MicroBatcher
+        classify_batcher = MicroBatcher(_classify_learned, max_batch_size, max_wait_ms, name='classify-batcher')
+    else:
+        classify_batcher = None
+    if old_batcher is not None:
+        old_batcher.close()
+    
+    # Cached pipeline results depend on the backend, model and threshold
+    from .pipeline import refresh_knowledge_version
+    refresh_knowledge_version()
+
+def _classify_learned(contexts: List[AnalysisContext]) -> List[str]:
+    """Predict a batch with the learned model, falling back to keywords when unsure"""
+    model = learned_model
+    if model is None:
+        return [classify_with_scores(context)[0] for context in contexts]
+    
+    predictions = model.predict([context.text for context in contexts])
+    return [
+        domain if confidence >= learned_min_confidence else classify_with_scores(context)[0]
+        for context, (domain, confidence) in zip(contexts, predictions)
+    ]
+
+def classify(text: TextInput) -> str:
+    """Classify legal text into domains using enhanced keyword-based approach"""
+    if learned_model is not None:
+        context = as_context(text)
+        batcher = classify_batcher
+        if batcher is None:
+            return _classify_learned([context])[0]
+        try:
+            return batcher.predict(context, classify_timeout)
+        except (FuturesTimeoutError, RuntimeError) as e:
+            # Batch too slow, or the batcher was replaced and closed meanwhile
+            print(f"Batched classification unavailable ({e!r}); using keywords")
+            return classify_with_scores(context)[0]
+    domain, _ = classify_with_scores(text)
+    return domain
+
+def classify_many(texts: Sequence[TextInput]) -> List[str]:
+    """Classify a batch of texts, vectorized when the learned backend is enabled"""
+    contexts = [as_context(text) for text in texts]
+    if learned_model is None:
+        return [classify_with_scores(context)[0] for context in contexts]
+    return _classify_learned(contexts)
+
+def get_classifier_fingerprint() -> Dict:
+    """What classification results depend on: backend, loaded model and confidence threshold"""
+    model = learned_model
+    if model is None:
+        return {"backend": "keywords"}
+    return {"backend": "learned", "model": getattr(model, "fingerprint", None),
+            "min_confidence": learned_min_confidence}
+
+def get_classifier_stats() -> Dict:
+    """Backend in use and, when batching, its queue and batch-size metrics"""
+    stats = {"backend": "learned" if learned_model is not None else "keywords"}
+    batcher = classify_batcher
+    if batcher is not None:
+        stats["batching"] = batcher.stats()
+    return stats
 
-def detect_specific_situation(text):
+def detect_specific_situation(text: TextInput) -> List[str]:
     """Detect specific legal situations within the text"""
-    text_lower = text.lower()
+    text_lower = as_context(text).lower
     situations = []
     
     # Criminal situations
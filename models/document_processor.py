@@ -1,8 +1,22 @@
-import PyPDF2
-import docx
+import multiprocessing
 import os
-from typing import Optional
+import queue
+import threading
+import time
+from typing import Dict, Iterator, Optional
 
+from .metrics import timed
+
+# Size of the pieces plain text files are read in
+TXT_CHUNK_SIZE = 64 * 1024
+
+# How often a waiting caller checks whether its extraction worker has died
+WORKER_POLL_INTERVAL = 0.5
+
+# How often an idle extraction worker checks whether its parent has died
+WORKER_IDLE_POLL_INTERVAL = 1.0
+
+@timed('process_document')
 def process_document(filepath: str) -> str:
     """Process uploaded documents and extract text content"""
     file_extension = filepath.split('.')[-1].lower()
@@ -19,34 +33,65 @@ def process_document(filepath: str) -> str:
     except Exception as e:
         return f"Error processing document: {str(e)}"
 
+def iter_document_text(filepath: str) -> Iterator[str]:
+    """Yield a document's text piece by piece as it is decoded.
+
+    Joining the pieces with ``"".join`` gives the full text, so callers can
+    either consume the stream incrementally or collect it in linear time.
+    """
+    file_extension = filepath.split('.')[-1].lower()
+
+    if file_extension == 'pdf':
+        return iter_pdf_text(filepath)
+    elif file_extension in ['docx', 'doc']:
+        return iter_docx_text(filepath)
+    elif file_extension == 'txt':
+        return iter_txt_text(filepath)
+    else:
+        raise ValueError("Unsupported file format")
+
+def iter_pdf_text(filepath: str) -> Iterator[str]:
+    """Yield the text of a PDF one page at a time"""
+    # Imported on first use so workers that never parse a PDF don't load it
+    import PyPDF2
+    
+    with open(filepath, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            yield (page.extract_text() or "") + "\n"
+
+def iter_docx_text(filepath: str) -> Iterator[str]:
+    """Yield the text of a DOCX one paragraph at a time"""
+    import docx
+    
+    doc = docx.Document(filepath)
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + "\n"
+
+def iter_txt_text(filepath: str) -> Iterator[str]:
+    """Yield the text of a TXT file in fixed-size chunks"""
+    with open(filepath, 'r', encoding='utf-8') as file:
+        for chunk in iter(lambda: file.read(TXT_CHUNK_SIZE), ''):
+            yield chunk
+
 def extract_pdf_text(filepath: str) -> str:
     """Extract text from PDF files"""
-    text = ""
     try:
-        with open(filepath, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text.strip()
+        return "".join(iter_pdf_text(filepath)).strip()
     except Exception as e:
         return f"Error reading PDF: {str(e)}"
 
 def extract_docx_text(filepath: str) -> str:
     """Extract text from DOCX files"""
     try:
-        doc = docx.Document(filepath)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
+        return "".join(iter_docx_text(filepath)).strip()
     except Exception as e:
         return f"Error reading DOCX: {str(e)}"
 
 def extract_txt_text(filepath: str) -> str:
     """Extract text from TXT files"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            return file.read().strip()
+        return "".join(iter_txt_text(filepath)).strip()
     except Exception as e:
         return f"Error reading TXT: {str(e)}"
 
@@ -59,4 +104,191 @@ def clean_extracted_text(text: str) -> str:
     text = text.replace('\x00', '')  # Remove null characters
     text = text.replace('\r', '\n')  # Normalize line endings
     
-    return text.strip() 
\ No newline at end of file
+    return text.strip()
+
+def _extraction_worker(filepath: str, results) -> None:
+    """Decode a document in a child process, sending each piece back as it is read"""
+    try:
+        pieces = iter_document_text(filepath)
+    except ValueError as e:
+        results.put(("error", str(e)))
+        return
+    
+    try:
+        for piece in pieces:
+            results.put(("text", piece))
+        results.put(("done", None))
+    except Exception as e:
+        results.put(("error", f"Error processing document: {str(e)}"))
+
+def _extraction_worker_loop(jobs, results) -> None:
+    """Serve extraction jobs in a long-lived child process until told to stop.
+
+    The worker also exits once its parent is gone, so workers of a web
+    process that was killed without cleaning up are not left behind.
+    """
+    parent = multiprocessing.parent_process()
+    while True:
+        try:
+            filepath = jobs.get(timeout=WORKER_IDLE_POLL_INTERVAL)
+        except queue.Empty:
+            if parent is not None and not parent.is_alive():
+                # Nobody will read what is still buffered for the parent
+                results.cancel_join_thread()
+                return
+            continue
+        if filepath is None:
+            return
+        _extraction_worker(filepath, results)
+
+class _ExtractionWorker:
+    """One long-lived worker process with its own job and result queues"""
+
+    __slots__ = ("process", "jobs", "results")
+
+    def __init__(self, context):
+        self.jobs = context.Queue()
+        self.results = context.Queue()
+        self.process = context.Process(target=_extraction_worker_loop, args=(self.jobs, self.results), daemon=True)
+        self.process.start()
+
+    def stop(self, kill: bool = False):
+        if kill:
+            self.process.terminate()
+        else:
+            self.jobs.put(None)
+        self.process.join()
+        self.jobs.close()
+        self.results.close()
+
+class ExtractionPool:
+    """Bounded pool of long-lived worker processes for document extraction.
+
+    At most ``max_workers`` documents are parsed at the same time, each in a
+    worker process so parsing neither holds the web worker's GIL nor survives
+    a stuck parser. Workers are started once and reused, since a spawned
+    process re-imports the main module; a worker is only replaced after it
+    ran out of time (and was killed) or died. Every job has a hard time
+    budget: when it runs out the text decoded so far is returned.
+
+    Workers are started on first use and belong to the process that started
+    them: a pool inherited through fork (e.g. ``gunicorn --preload``) starts
+    its own workers instead of sharing the parent's.
+    """
+
+    def __init__(self, max_workers: int = 2, timeout: float = 30.0, start_method: str = "spawn"):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._context = multiprocessing.get_context(start_method)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._owner_pid = os.getpid()
+
+    def _check_owner(self):
+        """Forget workers inherited from the process this one was forked from"""
+        if self._owner_pid != os.getpid():
+            # They are not our children, so they must not be touched at all
+            self._idle = []
+            self._lock = threading.Lock()
+            self._owner_pid = os.getpid()
+
+    def start(self):
+        """Start every worker ahead of the first upload"""
+        # Spawned children re-import the main module; they must not start a pool of their own
+        if multiprocessing.parent_process() is not None:
+            return
+        self._check_owner()
+        with self._lock:
+            while len(self._idle) < self.max_workers:
+                self._idle.append(_ExtractionWorker(self._context))
+
+    def close(self):
+        """Stop the idle workers"""
+        self._check_owner()
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+    def _acquire_worker(self) -> _ExtractionWorker:
+        self._check_owner()
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                worker.stop(kill=True)
+        return _ExtractionWorker(self._context)
+
+    def _release_worker(self, worker: _ExtractionWorker):
+        with self._lock:
+            self._idle.append(worker)
+
+    @timed('extract_document')
+    def extract(self, filepath: str, timeout: Optional[float] = None) -> Dict:
+        """Extract a document's text within the time budget.
+
+        Returns a dict with the extracted ``text``, whether extraction was
+        ``complete``, whether it ``timed_out`` and the worker's ``error`` (or
+        None). The time spent waiting for a free worker counts against the
+        budget.
+        """
+        budget = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + budget
+        
+        if not self._slots.acquire(timeout=budget):
+            return {"text": "", "complete": False, "timed_out": True, "error": None}
+        try:
+            return self._run(filepath, deadline)
+        finally:
+            self._slots.release()
+
+    def _run(self, filepath: str, deadline: float) -> Dict:
+        worker = self._acquire_worker()
+        worker.jobs.put(filepath)
+        
+        pieces = []
+        error = None
+        complete = False
+        timed_out = False
+        healthy = False
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                try:
+                    kind, payload = worker.results.get(timeout=min(remaining, WORKER_POLL_INTERVAL))
+                except queue.Empty:
+                    if worker.process.is_alive():
+                        continue
+                    # The worker may have exited before its last message was read
+                    try:
+                        kind, payload = worker.results.get(timeout=WORKER_POLL_INTERVAL)
+                    except queue.Empty:
+                        error = "Error processing document: extraction worker exited unexpectedly"
+                        break
+                
+                if kind == "text":
+                    pieces.append(payload)
+                elif kind == "error":
+                    error = payload
+                    healthy = True
+                    break
+                else:
+                    complete = True
+                    healthy = True
+                    break
+        finally:
+            # Workers that finished their job are reused; stuck or dead ones are replaced
+            if healthy and worker.process.is_alive():
+                self._release_worker(worker)
+            else:
+                worker.stop(kill=True)
+        
+        if error is not None and not pieces:
+            return {"text": error, "complete": False, "timed_out": False, "error": error}
+        
+        return {"text": "".join(pieces).strip(), "complete": complete, "timed_out": timed_out, "error": error}
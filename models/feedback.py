@@ -1,18 +1,173 @@
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime
 from typing import Dict, List
 
+# Legacy whole-file store, migrated into FEEDBACK_DB on first use
 FEEDBACK_FILE = 'data/feedback.json'
+FEEDBACK_DB = 'data/feedback.db'
+
+FEEDBACK_FIELDS = ("timestamp", "question", "answer", "rating", "feedback_text", "domain")
+
+# Values given to fields missing from legacy entries (timestamp defaults to the migration time)
+LEGACY_FIELD_DEFAULTS = {"question": "", "answer": "", "rating": 0, "feedback_text": ""}
+
+# Name recorded in the migrations table once the legacy file was imported
+LEGACY_FILE_MIGRATION = 'legacy_feedback_file'
+
+# Number of entries returned as recent feedback by get_feedback_stats
+RECENT_FEEDBACK_LIMIT = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    question TEXT,
+    answer TEXT,
+    rating INTEGER,
+    feedback_text TEXT,
+    domain TEXT
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY,
+    applied TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feedback_aggregates (
+    domain TEXT PRIMARY KEY,
+    total INTEGER NOT NULL,
+    rating_sum REAL NOT NULL,
+    rating_count INTEGER NOT NULL
+);
+"""
+
+_INSERT_FEEDBACK = (
+    "INSERT INTO feedback (timestamp, question, answer, rating, feedback_text, domain) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# Running per-domain totals, updated in the same transaction as each insert.
+# Only positive ratings count towards the average.
+_UPDATE_AGGREGATES = """
+INSERT INTO feedback_aggregates (domain, total, rating_sum, rating_count)
+VALUES (:domain, 1, CASE WHEN :rating > 0 THEN :rating ELSE 0 END, CASE WHEN :rating > 0 THEN 1 ELSE 0 END)
+ON CONFLICT(domain) DO UPDATE SET
+    total = total + 1,
+    rating_sum = rating_sum + excluded.rating_sum,
+    rating_count = rating_count + excluded.rating_count
+"""
+
+_REBUILD_AGGREGATES = """
+INSERT INTO feedback_aggregates (domain, total, rating_sum, rating_count)
+SELECT COALESCE(domain, 'Unknown'), COUNT(*),
+       SUM(CASE WHEN rating > 0 THEN rating ELSE 0 END),
+       SUM(CASE WHEN rating > 0 THEN 1 ELSE 0 END)
+FROM feedback GROUP BY COALESCE(domain, 'Unknown')
+"""
+
+# SQLite connections are not shared between threads
+_local = threading.local()
+
+# Aggregates are verified against the feedback rows once per process
+_aggregates_checked = False
+_aggregates_lock = threading.Lock()
 
 def ensure_data_directory():
     """Ensure the data directory exists"""
     os.makedirs('data', exist_ok=True)
 
+def _get_connection() -> sqlite3.Connection:
+    """Open (once per thread) the append-only feedback store.
+
+    WAL mode lets readers run alongside a writer and makes each save a single
+    appended row; synchronous=NORMAL batches fsyncs at checkpoints instead of
+    paying one per rating click.
+    """
+    connection = getattr(_local, 'connection', None)
+    if connection is None:
+        ensure_data_directory()
+        connection = sqlite3.connect(FEEDBACK_DB, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(_SCHEMA)
+        _migrate_feedback_file(connection)
+        _ensure_aggregates(connection)
+        _local.connection = connection
+    return connection
+
+def _ensure_aggregates(connection: sqlite3.Connection):
+    """Rebuild the running aggregates on startup if they disagree with the rows"""
+    global _aggregates_checked
+    with _aggregates_lock:
+        if _aggregates_checked:
+            return
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            feedback_count = connection.execute('SELECT COUNT(*) FROM feedback').fetchone()[0]
+            aggregated_count = connection.execute('SELECT COALESCE(SUM(total), 0) FROM feedback_aggregates').fetchone()[0]
+            if feedback_count != aggregated_count:
+                connection.execute('DELETE FROM feedback_aggregates')
+                connection.execute(_REBUILD_AGGREGATES)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        _aggregates_checked = True
+
+def _legacy_row(entry, migrated_at: str):
+    """Row values for one legacy entry, with defaults for missing fields, or None to skip it"""
+    if not isinstance(entry, dict):
+        print(f"Skipping malformed legacy feedback entry: {entry!r}")
+        return None
+    values = dict(LEGACY_FIELD_DEFAULTS, timestamp=migrated_at)
+    values.update((field, value) for field, value in entry.items() if value is not None)
+    return tuple(values.get(field) for field in FEEDBACK_FIELDS)
+
+def _migrate_feedback_file(connection: sqlite3.Connection):
+    """Import entries from the legacy JSON file once, then set it aside"""
+    if not os.path.exists(FEEDBACK_FILE):
+        return
+    
+    # The import is recorded in the same transaction as its rows, under the
+    # write lock, so concurrent workers migrate the file exactly once even if
+    # the file has not been renamed yet when the next one gets the lock
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        done = connection.execute(
+            'SELECT 1 FROM migrations WHERE name = ?', (LEGACY_FILE_MIGRATION,)
+        ).fetchone()
+        if done or not os.path.exists(FEEDBACK_FILE):
+            connection.rollback()
+        else:
+            try:
+                with open(FEEDBACK_FILE, 'r', encoding='utf-8') as f:
+                    legacy_feedback = json.load(f)
+            except json.JSONDecodeError:
+                legacy_feedback = []
+            if not isinstance(legacy_feedback, list):
+                print("Legacy feedback file does not hold a list of entries; nothing migrated")
+                legacy_feedback = []
+            
+            migrated_at = datetime.now().isoformat()
+            rows = [_legacy_row(entry, migrated_at) for entry in legacy_feedback]
+            connection.executemany(_INSERT_FEEDBACK, [row for row in rows if row is not None])
+            connection.execute('INSERT INTO migrations (name, applied) VALUES (?, ?)',
+                               (LEGACY_FILE_MIGRATION, migrated_at))
+            connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    
+    # Set the imported file aside; another worker may already have done so
+    try:
+        os.replace(FEEDBACK_FILE, FEEDBACK_FILE + '.migrated')
+    except FileNotFoundError:
+        pass
+
 def save_feedback(question: str, answer: str, rating: int, feedback_text: str = ""):
     """Save user feedback to the database"""
-    ensure_data_directory()
-    
     feedback_entry = {
         "timestamp": datetime.now().isoformat(),
         "question": question,
@@ -22,26 +177,22 @@ def save_feedback(question: str, answer: str, rating: int, feedback_text: str =
         "domain": classify_feedback_domain(question)
     }
     
-    # Load existing feedback
-    existing_feedback = load_feedback()
-    existing_feedback.append(feedback_entry)
-    
-    # Save updated feedback
-    with open(FEEDBACK_FILE, 'w', encoding='utf-8') as f:
-        json.dump(existing_feedback, f, indent=2, ensure_ascii=False)
+    # Append a single row and bump the running aggregates; earlier feedback
+    # is never rewritten
+    connection = _get_connection()
+    with connection:
+        connection.execute(
+            _INSERT_FEEDBACK,
+            tuple(feedback_entry[field] for field in FEEDBACK_FIELDS)
+        )
+        connection.execute(_UPDATE_AGGREGATES, {"domain": feedback_entry["domain"] or "Unknown", "rating": rating})
 
 def load_feedback() -> List[Dict]:
-    """Load existing feedback from file"""
-    ensure_data_directory()
-    
-    if not os.path.exists(FEEDBACK_FILE):
-        return []
-    
-    try:
-        with open(FEEDBACK_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    """Load existing feedback in the order it was saved"""
+    rows = _get_connection().execute(
+        'SELECT timestamp, question, answer, rating, feedback_text, domain FROM feedback ORDER BY id'
+    )
+    return [dict(row) for row in rows]
 
 def classify_feedback_domain(question: str) -> str:
     """Classify the domain of feedback for analysis"""
@@ -50,9 +201,21 @@ def classify_feedback_domain(question: str) -> str:
 
 def get_feedback_stats() -> Dict:
     """Get statistics from user feedback"""
-    feedback_data = load_feedback()
+    connection = _get_connection()
     
-    if not feedback_data:
+    # Read the aggregates and recent rows from one consistent snapshot
+    with connection:
+        connection.execute('BEGIN')
+        aggregates = connection.execute(
+            'SELECT domain, total, rating_sum, rating_count FROM feedback_aggregates'
+        ).fetchall()
+        recent_rows = connection.execute(
+            'SELECT timestamp, question, answer, rating, feedback_text, domain FROM feedback ORDER BY id DESC LIMIT ?',
+            (RECENT_FEEDBACK_LIMIT,)
+        ).fetchall()
+    
+    total_feedback = sum(row["total"] for row in aggregates)
+    if not total_feedback:
         return {
             "total_feedback": 0,
             "average_rating": 0,
@@ -60,25 +223,19 @@ def get_feedback_stats() -> Dict:
             "recent_feedback": []
         }
     
-    # Calculate statistics
-    total_feedback = len(feedback_data)
-    ratings = [f["rating"] for f in feedback_data if f["rating"] > 0]
-    average_rating = sum(ratings) / len(ratings) if ratings else 0
+    # Calculate statistics from the running totals
+    rating_count = sum(row["rating_count"] for row in aggregates)
+    rating_sum = sum(row["rating_sum"] for row in aggregates)
+    average_rating = rating_sum / rating_count if rating_count else 0
     
     # Domain distribution
-    domain_counts = {}
-    for feedback in feedback_data:
-        domain = feedback.get("domain", "Unknown")
-        domain_counts[domain] = domain_counts.get(domain, 0) + 1
-    
-    # Recent feedback (last 10)
-    recent_feedback = sorted(feedback_data, key=lambda x: x["timestamp"], reverse=True)[:10]
+    domain_counts = {row["domain"]: row["total"] for row in aggregates}
     
     return {
         "total_feedback": total_feedback,
         "average_rating": round(average_rating, 2),
         "domain_distribution": domain_counts,
-        "recent_feedback": recent_feedback
+        "recent_feedback": [dict(row) for row in recent_rows]
     }
 
 def get_domain_performance() -> Dict:
@@ -0,0 +1,67 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Endings a trigger may carry and still match, so "landlord" also finds "landlords"
+INFLECTION_SUFFIXES = ("s", "es", "ed", "ing")
+
+# Shorter triggers only match as whole words, so "hi" does not hit "his"
+# and "do" does not hit "does"
+MIN_INFLECTED_TRIGGER_LENGTH = 3
+
+class IntentMatch(NamedTuple):
+    intent: str
+    trigger: str
+
+class IntentRouter:
+    """Priority-ordered intent matcher compiled into a single regex.
+
+    Each rule is ``(intent, groups)`` where ``groups`` is a sequence of
+    trigger-word groups; the rule fires when every group has at least one
+    word-bounded hit (so ``[["do"], ["now"]]`` means "do" and "now"); a
+    trigger of ``MIN_INFLECTED_TRIGGER_LENGTH`` or more characters also hits
+    in its plural or inflected forms. All triggers are
+    found in one scan of the message and the earliest rule that fires wins.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Sequence[Sequence[str]]]]):
+        self.rules = [(intent, [tuple(group) for group in groups]) for intent, groups in rules]
+
+        # trigger -> [(rule index, group index), ...]
+        self._trigger_rules: Dict[str, List[Tuple[int, int]]] = {}
+        for rule_index, (_, groups) in enumerate(self.rules):
+            for group_index, group in enumerate(groups):
+                for trigger in group:
+                    self._trigger_rules.setdefault(trigger, []).append((rule_index, group_index))
+
+        # Longest first so phrases such as "laid off" win over their words
+        triggers = sorted(self._trigger_rules, key=len, reverse=True)
+        inflected = [re.escape(t) for t in triggers if len(t) >= MIN_INFLECTED_TRIGGER_LENGTH]
+        exact = [re.escape(t) for t in triggers if len(t) < MIN_INFLECTED_TRIGGER_LENGTH]
+        alternatives = []
+        if inflected:
+            alternatives.append("(?:" + "|".join(inflected) + ")(?:" + "|".join(INFLECTION_SUFFIXES) + ")?")
+        if exact:
+            alternatives.append("|".join(exact))
+        self._pattern = re.compile(r"\b(?:" + "|".join(alternatives) + r")\b")
+
+    def _matched_triggers(self, word: str) -> List[str]:
+        """Triggers a matched word stands for: itself and/or its stem without a suffix"""
+        candidates = [word] + [word[:-len(suffix)] for suffix in INFLECTION_SUFFIXES
+                               if word.endswith(suffix) and len(word) - len(suffix) >= MIN_INFLECTED_TRIGGER_LENGTH]
+        return [candidate for candidate in candidates if candidate in self._trigger_rules]
+
+    def route(self, text_lower: str) -> Optional[IntentMatch]:
+        """Return the highest-priority intent in already-lowercased text"""
+        # rule index -> {group index: first trigger that hit it}
+        hits: Dict[int, Dict[int, str]] = {}
+        for match in self._pattern.finditer(text_lower):
+            for trigger in self._matched_triggers(match.group()):
+                for rule_index, group_index in self._trigger_rules[trigger]:
+                    hits.setdefault(rule_index, {}).setdefault(group_index, trigger)
+
+        for rule_index in sorted(hits):
+            intent, groups = self.rules[rule_index]
+            group_hits = hits[rule_index]
+            if len(group_hits) == len(groups):
+                return IntentMatch(intent, " + ".join(group_hits[i] for i in range(len(groups))))
+        return None
@@ -0,0 +1,109 @@
+import hashlib
+import re
+import threading
+from typing import Dict, Optional
+
+from .cache import LRUCache
+
+# Number of detection results memoized by detect_language
+DETECTION_CACHE_SIZE = 4096
+
+# Seed for langdetect's sampling so the same text always gets the same answer
+DETECTOR_SEED = 0
+
+# Scripts that identify a language among the ones we support, checked in
+# order; kana before Han so Japanese with kanji is not taken for Chinese
+SCRIPT_LANGUAGES = (
+    ('ja', re.compile(r'[\u3040-\u30ff\u31f0-\u31ff]')),
+    ('ko', re.compile(r'[\u1100-\u11ff\u3130-\u318f\uac00-\ud7af]')),
+    ('zh-cn', re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff]')),
+    ('ur', re.compile(r'[\u0679\u0688\u0691\u06ba\u06be\u06c1\u06d2]')),
+    ('ar', re.compile(r'[\u0600-\u06ff\u0750-\u077f]')),
+    ('hi', re.compile(r'[\u0900-\u097f]')),
+    ('bn', re.compile(r'[\u0980-\u09ff]')),
+    ('ru', re.compile(r'[\u0400-\u04ff]'))
+)
+
+# Short function words used to guess Latin-script languages without the model
+STOPWORDS = {
+    'en': {'the', 'and', 'is', 'are', 'was', 'my', 'i', 'to', 'of', 'for', 'with', 'what', 'can', 'have', 'do', 'not', 'me', 'it', 'you', 'this'},
+    'es': {'el', 'la', 'los', 'las', 'y', 'es', 'mi', 'de', 'que', 'en', 'por', 'para', 'con', 'una', 'un', 'no', 'me', 'qué', 'puedo', 'del'},
+    'fr': {'le', 'la', 'les', 'et', 'est', 'mon', 'ma', 'je', 'de', 'que', 'pour', 'avec', 'une', 'un', 'ne', 'pas', 'des', 'du', 'qui', 'mes'},
+    'de': {'der', 'die', 'das', 'und', 'ist', 'mein', 'meine', 'ich', 'nicht', 'mit', 'für', 'ein', 'eine', 'zu', 'von', 'was', 'kann', 'den', 'dem', 'wurde'},
+    'it': {'il', 'lo', 'gli', 'e', 'è', 'mio', 'mia', 'che', 'di', 'per', 'con', 'una', 'non', 'sono', 'del', 'della', 'cosa', 'posso', 'ho', 'mi'},
+    'pt': {'o', 'os', 'as', 'e', 'é', 'meu', 'minha', 'que', 'de', 'para', 'com', 'uma', 'um', 'não', 'do', 'da', 'em', 'posso', 'eu', 'fui'},
+    'nl': {'de', 'het', 'een', 'en', 'is', 'mijn', 'ik', 'niet', 'van', 'voor', 'met', 'wat', 'kan', 'dat', 'op', 'ben', 'zijn', 'werd', 'naar', 'ook'}
+}
+
+# Stopword hits needed before trusting the guess, and how far ahead of the
+# runner-up language it has to be
+MIN_STOPWORD_HITS = 2
+STOPWORD_MARGIN = 2
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+_detection_cache = LRUCache(DETECTION_CACHE_SIZE)
+_init_lock = threading.Lock()
+_detect = None
+
+def init_language_detector():
+    """Load langdetect's profiles and fix its seed, so no request pays for it"""
+    global _detect
+    with _init_lock:
+        if _detect is not None:
+            return
+        from langdetect import DetectorFactory, detect
+        from langdetect.detector_factory import init_factory
+        DetectorFactory.seed = DETECTOR_SEED
+        init_factory()
+        _detect = detect
+
+def detect_script_language(text: str) -> Optional[str]:
+    """Language implied by a non-Latin script in the text, if any"""
+    if text.isascii():
+        return None
+    for language, pattern in SCRIPT_LANGUAGES:
+        if pattern.search(text):
+            return language
+    return None
+
+def guess_from_stopwords(text: str) -> Optional[str]:
+    """Guess a Latin-script language from its function words, or None if unsure"""
+    words = _WORD_PATTERN.findall(text.lower())
+    scores = sorted(
+        ((sum(word in stopwords for word in words), language) for language, stopwords in STOPWORDS.items()),
+        reverse=True
+    )
+    (best, language), (runner_up, _) = scores[0], scores[1]
+    if best >= MIN_STOPWORD_HITS and best >= runner_up * STOPWORD_MARGIN and best > runner_up:
+        return language
+    return None
+
+def _detect_uncached(text: str) -> Optional[str]:
+    language = detect_script_language(text) or guess_from_stopwords(text)
+    if language is not None:
+        return language
+
+    if _detect is None:
+        init_language_detector()
+    return _detect(text)
+
+def detect_language(text: str) -> Optional[str]:
+    """Detect the language of input text"""
+    try:
+        if not _WORD_PATTERN.search(text):
+            return None
+
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        language = _detection_cache.get(key)
+        if language is None:
+            language = _detect_uncached(text)
+            _detection_cache.put(key, language)
+        return language
+    except Exception as e:
+        print(f"Language detection error: {e}")
+        return None
+
+def get_detection_cache_stats() -> Dict:
+    """Hit/miss counters for the detection memo"""
+    return _detection_cache.stats()
@@ -0,0 +1,225 @@
+"""TF-IDF + logistic regression backend for legal domain classification.
+
+Training (scikit-learn) happens offline from a labelled CSV:
+
+    python -m models.learned_classifier data/training.csv --model-dir data/classifier_model
+
+The fitted model is saved as small JSON metadata plus plain ``.npy`` arrays:
+the vocabulary is a sorted array of terms whose position is the feature
+index, and the idf and weight columns follow the same order. Workers load
+every array with ``mmap_mode='r'`` and look terms up by binary search, so all
+processes on a machine share one copy of the vocabulary and weights through
+the page cache.
+"""
+
+import csv
+import hashlib
+import json
+import math
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import normalize
+
+# Where the trained model is written and loaded from by default
+DEFAULT_MODEL_DIR = 'data/classifier_model'
+
+MODEL_FILES = {
+    "metadata": "model.json",
+    "terms": "terms.npy",
+    "idf": "idf.npy",
+    "coef": "coef.npy",
+    "intercept": "intercept.npy"
+}
+
+# Share of the training rows held out to fit the calibration temperature
+CALIBRATION_FRACTION = 0.2
+
+# Temperatures tried when calibrating, on a log scale from 1/10 to 10
+CALIBRATION_TEMPERATURES = [10 ** (step / 20) for step in range(-20, 21)]
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+def _logits(features, coef: np.ndarray, intercept: np.ndarray) -> np.ndarray:
+    """Class scores for a sparse feature matrix, one column per class"""
+    scores = features @ coef.T + intercept
+    if coef.shape[0] == 1:
+        # Binary logistic regression keeps one row of weights for the second class
+        scores = np.hstack([np.zeros_like(scores), scores])
+    return np.asarray(scores)
+
+def _fit_temperature(logits: np.ndarray, labels: np.ndarray) -> float:
+    """Temperature that minimises the negative log-likelihood of held-out labels"""
+    best_temperature, best_loss = 1.0, math.inf
+    rows = np.arange(len(labels))
+    for temperature in CALIBRATION_TEMPERATURES:
+        probabilities = _softmax(logits / temperature)
+        loss = -np.log(np.clip(probabilities[rows, labels], 1e-12, None)).mean()
+        if loss < best_loss:
+            best_temperature, best_loss = temperature, loss
+    return best_temperature
+
+def load_training_data(csv_path: str, text_column: str = 'text', label_column: str = 'label') -> Tuple[List[str], List[str]]:
+    """Read (texts, labels) from a CSV with a header row"""
+    texts, labels = [], []
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            text, label = row.get(text_column), row.get(label_column)
+            if text and label:
+                texts.append(text)
+                labels.append(label.strip())
+    return texts, labels
+
+def _fit(texts: Sequence[str], labels: Sequence[int], ngram_range: Tuple[int, int], min_df: int, C: float):
+    vectorizer = TfidfVectorizer(ngram_range=ngram_range, min_df=min_df)
+    features = vectorizer.fit_transform(texts)
+    model = LogisticRegression(C=C, max_iter=1000)
+    model.fit(features, labels)
+    return vectorizer, model
+
+def train_classifier(csv_path: str, model_dir: str = DEFAULT_MODEL_DIR, text_column: str = 'text',
+                     label_column: str = 'label', ngram_range: Tuple[int, int] = (1, 2), min_df: int = 1,
+                     C: float = 10.0) -> Dict:
+    """Train on a labelled CSV, calibrate, and save the model to model_dir"""
+    texts, label_names = load_training_data(csv_path, text_column, label_column)
+    labels = sorted(set(label_names))
+    if len(labels) < 2:
+        raise ValueError("Training data needs at least two labels")
+    label_ids = np.array([labels.index(name) for name in label_names])
+
+    # Fit the temperature on held-out rows, then refit on everything
+    temperature = 1.0
+    counts = np.bincount(label_ids)
+    holdout = int(len(texts) * CALIBRATION_FRACTION)
+    if holdout >= len(labels) and counts.min() >= 2:
+        train_texts, held_texts, train_ids, held_ids = train_test_split(
+            texts, label_ids, test_size=holdout, stratify=label_ids, random_state=0
+        )
+        if len(set(train_ids)) == len(labels):
+            vectorizer, model = _fit(train_texts, train_ids, ngram_range, min_df, C)
+            held_logits = _logits(vectorizer.transform(held_texts), model.coef_, model.intercept_)
+            temperature = _fit_temperature(held_logits, held_ids)
+
+    vectorizer, model = _fit(texts, label_ids, ngram_range, min_df, C)
+
+    # Renumber the features in term order, so a term's position in the
+    # sorted term array is its column in idf and coef
+    terms = sorted(vectorizer.vocabulary_)
+    order = np.array([vectorizer.vocabulary_[term] for term in terms])
+
+    os.makedirs(model_dir, exist_ok=True)
+    metadata = {
+        "labels": labels,
+        "features": len(terms),
+        "ngram_range": list(ngram_range),
+        "temperature": temperature,
+        "training_rows": len(texts)
+    }
+    with open(os.path.join(model_dir, MODEL_FILES["metadata"]), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False)
+    np.save(os.path.join(model_dir, MODEL_FILES["terms"]), np.array(terms, dtype=str))
+    np.save(os.path.join(model_dir, MODEL_FILES["idf"]), vectorizer.idf_[order].astype(np.float64))
+    np.save(os.path.join(model_dir, MODEL_FILES["coef"]), model.coef_[:, order].astype(np.float64))
+    np.save(os.path.join(model_dir, MODEL_FILES["intercept"]), model.intercept_.astype(np.float64))
+
+    return {"labels": labels, "rows": len(texts), "features": len(terms), "temperature": temperature}
+
+def model_fingerprint(model_dir: str, metadata_bytes: bytes) -> str:
+    """Short hash of a saved model's metadata and arrays, identifying it across reloads"""
+    digest = hashlib.blake2b(metadata_bytes, digest_size=8)
+    for name in sorted(MODEL_FILES):
+        if name != "metadata":
+            with open(os.path.join(model_dir, MODEL_FILES[name]), 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+    return digest.hexdigest()
+
+class LearnedClassifier:
+    """Trained TF-IDF + linear model loaded from disk for batch prediction"""
+
+    def __init__(self, model_dir: str = DEFAULT_MODEL_DIR):
+        with open(os.path.join(model_dir, MODEL_FILES["metadata"]), 'rb') as f:
+            metadata_bytes = f.read()
+        metadata = json.loads(metadata_bytes)
+        self.fingerprint = model_fingerprint(model_dir, metadata_bytes)
+
+        self.labels: List[str] = metadata["labels"]
+        self.temperature: float = metadata["temperature"]
+        # Tokenisation matches the TfidfVectorizer defaults used in training
+        self.analyzer = CountVectorizer(ngram_range=tuple(metadata["ngram_range"])).build_analyzer()
+
+        # Read-only memory maps, shared between worker processes
+        self.terms = np.load(os.path.join(model_dir, MODEL_FILES["terms"]), mmap_mode='r')
+        self.idf = np.load(os.path.join(model_dir, MODEL_FILES["idf"]), mmap_mode='r')
+        self.coef = np.load(os.path.join(model_dir, MODEL_FILES["coef"]), mmap_mode='r')
+        self.intercept = np.load(os.path.join(model_dir, MODEL_FILES["intercept"]), mmap_mode='r')
+
+    def _term_counts(self, texts: Sequence[str]) -> csr_matrix:
+        """Sparse term counts, looking each token up in the sorted term array"""
+        rows, tokens = [], []
+        for row, text in enumerate(texts):
+            text_tokens = self.analyzer(text)
+            rows.extend([row] * len(text_tokens))
+            tokens.extend(text_tokens)
+        
+        shape = (len(texts), len(self.terms))
+        if not tokens:
+            return csr_matrix(shape, dtype=np.float64)
+        tokens = np.array(tokens, dtype=str)
+        positions = np.searchsorted(self.terms, tokens)
+        found = positions < len(self.terms)
+        found[found] = self.terms[positions[found]] == tokens[found]
+        
+        # Repeated (row, column) entries are summed into counts
+        counts = csr_matrix((np.ones(found.sum()), (np.array(rows)[found], positions[found])), shape=shape)
+        counts.sum_duplicates()
+        return counts
+
+    def transform(self, texts: Sequence[str]):
+        """TF-IDF features as a sparse matrix, one row per text"""
+        counts = self._term_counts(texts)
+        # Scale each column by its idf without densifying
+        counts.data *= np.take(self.idf, counts.indices)
+        return normalize(counts, norm='l2', copy=False)
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Calibrated class probabilities, one row per text"""
+        return _softmax(_logits(self.transform(texts), self.coef, self.intercept) / self.temperature)
+
+    def predict(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """(label, probability) of the most likely class for each text"""
+        if not texts:
+            return []
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[index], float(probabilities[row, index])) for row, index in enumerate(best)]
+
+def load_learned_classifier(model_dir: str = DEFAULT_MODEL_DIR) -> Optional[LearnedClassifier]:
+    """Load a trained model, or None if there is none usable in model_dir"""
+    try:
+        return LearnedClassifier(model_dir)
+    except Exception as e:
+        print(f"Error loading learned classifier: {e}")
+        return None
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the TF-IDF + logistic regression domain classifier")
+    parser.add_argument("csv_path", help="CSV file with text and label columns")
+    parser.add_argument("--model-dir", default=DEFAULT_MODEL_DIR)
+    parser.add_argument("--text-column", default='text')
+    parser.add_argument("--label-column", default='label')
+    parser.add_argument("--C", type=float, default=10.0, help="inverse regularisation strength")
+    args = parser.parse_args()
+
+    summary = train_classifier(args.csv_path, args.model_dir, args.text_column, args.label_column, C=args.C)
+    print(json.dumps(summary, indent=2))
@@ -1,6 +1,11 @@
+import heapq
 import json
+import math
 import os
-from typing import List, Dict
+from collections import Counter
+from typing import Iterable, List, Dict
+
+from .analysis import TextInput, as_context, tokenize
 
 # Simulated legal database
 LEGAL_DATABASE = {
@@ -150,32 +155,128 @@ LEGAL_DATABASE = {
     }
 }
 
-def search_legal_database(domain: str, query: str) -> Dict:
+# Record fields that are tokenized into the search index
+INDEXED_FIELDS = ("title", "description", "section", "citation")
+
+# Function words left out of the index and of queries; they appear in nearly
+# every record and would otherwise make each query walk most postings
+INDEX_STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "i", "in", "is", "it",
+    "me", "my", "of", "on", "or", "that", "the", "this", "to", "was", "we", "were", "with", "you", "your"
+])
+
+class LegalSearchIndex:
+    """Inverted index over statutes and cases scored with Okapi BM25"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents = []  # (domain, kind, record) per document id
+        self.doc_lengths = []
+        self.total_length = 0
+        # (domain, kind) -> term -> list of (document id, term frequency), so a
+        # filtered query only walks the postings of its own domain and kind
+        self.postings = {}
+        self.document_frequency = Counter()  # term -> documents containing it, over all partitions
+        self.default_order = {}  # (domain, kind) -> document ids, best prior first
+        self._unsorted = set()
+
+    def add_document(self, domain: str, kind: str, record: Dict):
+        """Tokenize a statute or case record and add it to the index"""
+        doc_id = len(self.documents)
+        text = " ".join(str(record[field]) for field in INDEXED_FIELDS if field in record)
+        term_counts = Counter(term for term in tokenize(text.lower()) if term not in INDEX_STOPWORDS)
+
+        self.documents.append((domain, kind, record))
+        length = sum(term_counts.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+        partition = self.postings.setdefault((domain, kind), {})
+        for term, frequency in term_counts.items():
+            partition.setdefault(term, []).append((doc_id, frequency))
+            self.document_frequency[term] += 1
+
+        self.default_order.setdefault((domain, kind), []).append(doc_id)
+        self._unsorted.add((domain, kind))
+
+    def _prior(self, doc_id: int) -> float:
+        return self.documents[doc_id][2].get("relevance_score", 0)
+
+    def _defaults(self, domain: str, kind: str) -> List[int]:
+        # Without a query match, statutes rank by their static relevance score
+        # and cases keep their listed order (the sort is stable)
+        key = (domain, kind)
+        if key in self._unsorted:
+            self.default_order[key] = sorted(self.default_order[key], key=self._prior, reverse=True)
+            self._unsorted.discard(key)
+        return self.default_order.get(key, [])
+
+    def score(self, terms: Iterable[str], domain: str = None, kind: str = None) -> Dict[int, float]:
+        """BM25 score of every matching document, optionally filtered"""
+        scores = {}
+        if not self.documents:
+            return scores
+
+        if domain is not None and kind is not None:
+            partition = self.postings.get((domain, kind))
+            partitions = [partition] if partition is not None else []
+        else:
+            partitions = [postings for (doc_domain, doc_kind), postings in self.postings.items()
+                          if (domain is None or doc_domain == domain) and (kind is None or doc_kind == kind)]
+
+        total_docs = len(self.documents)
+        average_length = self.total_length / total_docs or 1
+        for term in set(terms):
+            document_frequency = self.document_frequency.get(term)
+            if not document_frequency:
+                continue
+            idf = math.log(1 + (total_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+            for partition in partitions:
+                for doc_id, frequency in partition.get(term, ()):
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, terms: Iterable[str], domain: str, kind: str, limit: int) -> List[Dict]:
+        """Return the top records of one kind in a domain.
+
+        Records are ranked by BM25 and, when fewer than ``limit`` match the
+        query, padded with the domain's default-ordered records.
+        """
+        scores = self.score(terms, domain, kind)
+        top = heapq.nlargest(limit, scores, key=lambda doc_id: (scores[doc_id], self._prior(doc_id)))
+
+        if len(top) < limit:
+            chosen = set(top)
+            for doc_id in self._defaults(domain, kind):
+                if len(top) == limit:
+                    break
+                if doc_id not in chosen:
+                    top.append(doc_id)
+
+        return [self.documents[doc_id][2] for doc_id in top]
+
+def build_search_index(database: Dict) -> LegalSearchIndex:
+    """Build a search index over every statute and case in a legal database"""
+    index = LegalSearchIndex()
+    for domain, domain_data in database.items():
+        for kind in ("statutes", "cases"):
+            for record in domain_data.get(kind, []):
+                index.add_document(domain, kind, record)
+    return index
+
+SEARCH_INDEX = build_search_index(LEGAL_DATABASE)
+
+def search_legal_database(domain: str, query: TextInput, statute_limit: int = 3, case_limit: int = 2) -> Dict:
     """Search legal database for relevant information"""
     if domain not in LEGAL_DATABASE:
         return {"statutes": [], "cases": []}
     
-    domain_data = LEGAL_DATABASE[domain]
-    
-    # Filter statutes by relevance to query
-    relevant_statutes = []
-    query_lower = query.lower()
-    
-    for statute in domain_data["statutes"]:
-        # Simple keyword matching for relevance
-        keywords = query_lower.split()
-        statute_text = f"{statute['title']} {statute['description']}".lower()
-        
-        relevance_count = sum(1 for keyword in keywords if keyword in statute_text)
-        if relevance_count > 0:
-            relevant_statutes.append(statute)
-    
-    # Sort by relevance score
-    relevant_statutes.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+    terms = as_context(query).tokens
     
     return {
-        "statutes": relevant_statutes[:3],  # Top 3 most relevant
-        "cases": domain_data["cases"][:2]  # Top 2 cases
+        "statutes": SEARCH_INDEX.search(terms, domain, "statutes", statute_limit),
+        "cases": SEARCH_INDEX.search(terms, domain, "cases", case_limit)
     }
 
 def get_legal_forms(domain: str) -> List[Dict]:
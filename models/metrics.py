@@ -0,0 +1,217 @@
+"""In-process metrics with Prometheus text exposition.
+
+Stages are timed with ``stage_timer(name)`` blocks or the ``timed(name)``
+decorator, which record a duration histogram, an error counter and an
+in-flight gauge per stage. Set METRICS_ENABLED=0 to switch instrumentation
+off: ``timed`` then returns the function unchanged and ``stage_timer``
+returns a shared ``nullcontext``, so nothing is measured or stored.
+"""
+
+import bisect
+import functools
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Read once at import, since decorators are applied when modules load
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+
+# Histogram bucket upper bounds in seconds, from 0.1 ms to 10 s
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class _Metric(ABC):
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *label_values: str):
+        """The child series for one combination of label values"""
+        key = tuple(str(value) for value in label_values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A new series holding one combination of label values"""
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Exposition lines for every series"""
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._samples())
+        return '\n'.join(lines)
+
+class _Value:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def _samples(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.label_names, key)} {_format_value(child.value)}'
+                for key, child in sorted(self._children.items())]
+
+class Gauge(Counter):
+    """Value that goes up and down, such as work in flight"""
+    kind = 'gauge'
+
+class _HistogramValue:
+    __slots__ = ('upper_bounds', 'bucket_counts', 'sum', 'count', '_lock')
+
+    def __init__(self, upper_bounds: Sequence[float]):
+        self.upper_bounds = upper_bounds
+        self.bucket_counts = [0] * (len(upper_bounds) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.bucket_counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in sorted(self._children.items()):
+            with child._lock:
+                counts, total, count = list(child.bucket_counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = 'le="' + ('+Inf' if bound == float('inf') else _format_value(bound)) + '"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.label_names, key)} {count}')
+        return lines
+
+class Registry:
+    """Named metrics rendered together in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'legal_stage_duration_seconds', 'Time spent in each processing stage', ['stage']))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    'legal_stage_errors_total', 'Processing stages that ended with an exception', ['stage']))
+STAGE_IN_FLIGHT = REGISTRY.register(Gauge(
+    'legal_stage_in_flight', 'Processing stages currently running', ['stage']))
+
+class _StageTimer:
+    __slots__ = ('duration', 'errors', 'in_flight', 'start')
+
+    def __init__(self, stage: str):
+        self.duration = STAGE_SECONDS.labels(stage)
+        self.errors = STAGE_ERRORS.labels(stage)
+        self.in_flight = STAGE_IN_FLIGHT.labels(stage)
+
+    def __enter__(self):
+        self.in_flight.inc()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration.observe(time.perf_counter() - self.start)
+        self.in_flight.dec()
+        if exc_type is not None:
+            self.errors.inc()
+        return False
+
+_NULL_TIMER = nullcontext()
+
+def stage_timer(stage: str):
+    """Context manager timing one run of a stage"""
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return _StageTimer(stage)
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    """Decorator timing every call of a function as a stage"""
+    def decorator(func: Callable) -> Callable:
+        if not METRICS_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _StageTimer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def render_metrics() -> str:
+    """Every registered metric in Prometheus text exposition format"""
+    return REGISTRY.render()
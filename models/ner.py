@@ -1,56 +1,85 @@
 # models/ner.py
 
+import bisect
 import re
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional
 
-def extract_entities(text: str) -> List[Dict]:
-    """Extract legal entities using pattern matching"""
+from .analysis import TextInput, as_context
+
+# Legal-specific entity patterns
+LEGAL_PATTERNS = {
+    "PERSON": r"\b[A-Z][a-z]+ [A-Z][a-z]+\b",  # Names
+    "ORGANIZATION": r"\b[A-Z][a-zA-Z\s&]+(?:Corp|Inc|LLC|Ltd|Company|Law Firm|Court)\b",
+    "DATE": r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b",
+    "MONEY": r"\$\d+(?:,\d{3})*(?:\.\d{2})?|\d+(?:,\d{3})*(?:\.\d{2})?\s*(?:dollars|USD)",
+    "LAW_REFERENCE": r"\b(?:Section|Article|Chapter|Title)\s+\d+[A-Z]?\b",
+    "COURT": r"\b(?:Supreme Court|District Court|Circuit Court|Appeals Court|Federal Court)\b",
+    "CASE_NUMBER": r"\b(?:Case|Docket)\s+(?:No\.?|Number)\s+[A-Z0-9-]+\b"
+}
+
+# Common legal keywords
+LEGAL_KEYWORDS = {
+    "LEGAL_TERM": ["attorney", "lawyer", "judge", "plaintiff", "defendant", "witness", "evidence", "testimony", "verdict", "appeal", "motion", "hearing", "trial", "settlement", "damages", "compensation", "liability", "negligence"]
+}
+
+# Compiled once at import. Each label is scanned on its own, so entities of
+# different labels may overlap (e.g. PERSON "John Smith" inside
+# ORGANIZATION "John Smith Corp")
+_LABEL_PATTERNS = [
+    (label, re.compile(pattern, re.IGNORECASE)) for label, pattern in LEGAL_PATTERNS.items()
+]
+
+def _keyword_pattern(keywords: Iterable[str], flags: int = 0):
+    return re.compile("(?=(" + "|".join(re.escape(keyword.lower()) for keyword in keywords) + "))", flags)
+
+# All keywords of a label in one alternation, scanned once per text over
+# the lowercased text, where the regex engine can skip ahead on literals
+# (IGNORECASE would disable that). The lookahead tries every position, so
+# keywords running into each other ("defendantrial") are each found, as
+# when every keyword was scanned for separately; no keyword contains
+# another, so one position matches at most one keyword
+_KEYWORD_PATTERNS = [(label, _keyword_pattern(keywords)) for label, keywords in LEGAL_KEYWORDS.items()]
+
+# Used instead when lowercasing changes the text's length, so offsets in the
+# lowercased text would not line up with the original
+_KEYWORD_PATTERNS_IGNORECASE = [
+    (label, _keyword_pattern(keywords, re.IGNORECASE)) for label, keywords in LEGAL_KEYWORDS.items()
+]
+
+# Joins the texts of a batch into one string; no pattern matches across it
+_BATCH_SEPARATOR = "\x00"
+
+def _scan(text: str, text_lower: Optional[str] = None) -> List[Dict]:
+    """Every label and keyword match in text, labels first, in pattern order"""
     entities = []
-    
-    # Legal-specific entity patterns
-    legal_patterns = {
-        "PERSON": r"\b[A-Z][a-z]+ [A-Z][a-z]+\b",  # Names
-        "ORGANIZATION": r"\b[A-Z][a-zA-Z\s&]+(?:Corp|Inc|LLC|Ltd|Company|Law Firm|Court)\b",
-        "DATE": r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b",
-        "MONEY": r"\$\d+(?:,\d{3})*(?:\.\d{2})?|\d+(?:,\d{3})*(?:\.\d{2})?\s*(?:dollars|USD)",
-        "LAW_REFERENCE": r"\b(?:Section|Article|Chapter|Title)\s+\d+[A-Z]?\b",
-        "COURT": r"\b(?:Supreme Court|District Court|Circuit Court|Appeals Court|Federal Court)\b",
-        "CASE_NUMBER": r"\b(?:Case|Docket)\s+(?:No\.?|Number)\s+[A-Z0-9-]+\b"
-    }
-    
-    # Extract legal-specific entities using regex patterns
-    for label, pattern in legal_patterns.items():
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            entity_info = {
+    for label, pattern in _LABEL_PATTERNS:
+        for match in pattern.finditer(text):
+            entities.append({
                 "text": match.group(),
                 "label": label,
                 "start": match.start(),
                 "end": match.end()
-            }
-            entities.append(entity_info)
+            })
     
-    # Also extract common legal keywords
-    legal_keywords = {
-        "LEGAL_TERM": ["attorney", "lawyer", "judge", "plaintiff", "defendant", "witness", "evidence", "testimony", "verdict", "appeal", "motion", "hearing", "trial", "settlement", "damages", "compensation", "liability", "negligence"]
-    }
-    
-    text_lower = text.lower()
-    for label, keywords in legal_keywords.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                # Find the actual text in the original case
-                pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-                for match in pattern.finditer(text):
-                    entity_info = {
-                        "text": match.group(),
-                        "label": label,
-                        "start": match.start(),
-                        "end": match.end()
-                    }
-                    entities.append(entity_info)
-    
-    # Remove duplicates and sort by position
+    if text_lower is None:
+        text_lower = text.lower()
+    if len(text_lower) == len(text):
+        keyword_patterns = _KEYWORD_PATTERNS
+    else:
+        keyword_patterns, text_lower = _KEYWORD_PATTERNS_IGNORECASE, text
+    for label, pattern in keyword_patterns:
+        for match in pattern.finditer(text_lower):
+            start, end = match.span(1)
+            entities.append({
+                "text": text[start:end],
+                "label": label,
+                "start": start,
+                "end": end
+            })
+    return entities
+
+def _deduplicate(entities: List[Dict]) -> List[Dict]:
+    """Sort by position (stable, so the first label wins) and drop repeated spans"""
     unique_entities = []
     seen = set()
     for entity in sorted(entities, key=lambda x: x["start"]):
@@ -58,9 +87,37 @@ def extract_entities(text: str) -> List[Dict]:
         if entity_key not in seen:
             seen.add(entity_key)
             unique_entities.append(entity)
-    
     return unique_entities
 
+def extract_entities(text: TextInput) -> List[Dict]:
+    """Extract legal entities using pattern matching"""
+    context = as_context(text)
+    return _deduplicate(_scan(context.text, context.lower))
+
+def extract_entities_many(texts: Iterable[TextInput]) -> List[List[Dict]]:
+    """Extract entities from a batch of texts.
+
+    The texts are joined and every pattern is run once over the whole batch,
+    instead of once per text; matches are then split back by offset.
+    """
+    texts = [as_context(text).text for text in texts]
+    if any(_BATCH_SEPARATOR in text for text in texts):
+        return [extract_entities(text) for text in texts]
+    
+    offsets = []
+    position = 0
+    for text in texts:
+        offsets.append(position)
+        position += len(text) + len(_BATCH_SEPARATOR)
+    
+    per_text = [[] for _ in texts]
+    for entity in _scan(_BATCH_SEPARATOR.join(texts)):
+        index = bisect.bisect_right(offsets, entity["start"]) - 1
+        entity["start"] -= offsets[index]
+        entity["end"] -= offsets[index]
+        per_text[index].append(entity)
+    return [_deduplicate(entities) for entities in per_text]
+
 def get_entity_texts(entities: List[Dict]) -> List[str]:
     """Extract just the text of entities for display"""
-    return [entity["text"] for entity in entities] 
\ No newline at end of file
+    return [entity["text"] for entity in entities]
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import re
+import unicodedata
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import classifier, legal_database, ner, qa, translator
+from .analysis import AnalysisContext
+from .classifier import classify, classify_many
+from .ner import extract_entities, get_entity_texts
+from .qa import answer_question, get_legal_references
+from .legal_database import search_legal_database
+from .metrics import REGISTRY, Counter, stage_timer
+from .result_cache import ResultCache
+from .translator import translate_text, detect_language
+
+# Largest number of inputs accepted in one /api/analyze request
+MAX_BATCH_SIZE = 1000
+
+# Batch inputs are classified together in chunks of this many, and each
+# chunk's results are yielded once it is done
+BATCH_CHUNK_SIZE = 256
+
+# Default bounds of the whole-pipeline result cache
+RESULT_CACHE_BYTES = 32 * 1024 * 1024
+RESULT_CACHE_TTL = 3600.0
+
+RESULT_CACHE_LOOKUPS = REGISTRY.register(Counter(
+    'legal_result_cache_lookups_total', 'Result cache lookups by outcome', ['result']))
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def normalize_input(text: str) -> str:
+    """Canonical form of a question: NFC, single spaces, no outer whitespace"""
+    return _WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+def _knowledge_data() -> Dict:
+    """Everything an analysis result is derived from"""
+    return {
+        "domain_keywords": classifier.DOMAIN_KEYWORDS,
+        "keyword_weights": classifier.KEYWORD_WEIGHTS,
+        "classifier": classifier.get_classifier_fingerprint(),
+        "legal_patterns": ner.LEGAL_PATTERNS,
+        "legal_keywords": ner.LEGAL_KEYWORDS,
+        "legal_knowledge": qa.LEGAL_KNOWLEDGE,
+        "situation_triggers": qa.SITUATION_TRIGGERS,
+        "answer_catalogs": {language: {part: list(entries.items()) if isinstance(entries, Mapping) else entries
+                                       for part, entries in catalog.items()}
+                            for language, catalog in qa.ANSWER_CATALOGS.items()},
+        "legal_database": legal_database.LEGAL_DATABASE,
+        "translations": translator.TRANSLATIONS
+    }
+
+def compute_knowledge_version() -> str:
+    """Short hash of the knowledge base, dictionaries and classifier configuration"""
+    payload = json.dumps(_knowledge_data(), sort_keys=True, ensure_ascii=False,
+                         default=lambda value: dict(value) if isinstance(value, Mapping) else repr(value))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+# Results are keyed by (version, dictionary and catalog generations,
+# normalized text, requested language), so neither a knowledge change nor a
+# rebuild of the translators or answer catalogs serves an answer computed
+# from the old data
+knowledge_version = compute_knowledge_version()
+result_cache = ResultCache(RESULT_CACHE_BYTES, RESULT_CACHE_TTL)
+
+def configure_result_cache(max_bytes: int = RESULT_CACHE_BYTES, ttl: Optional[float] = RESULT_CACHE_TTL):
+    """Resize the result cache (0 bytes disables it) and re-read the knowledge version"""
+    global result_cache
+    result_cache = ResultCache(max_bytes, ttl)
+    refresh_knowledge_version()
+
+def refresh_knowledge_version():
+    """Recompute the knowledge version, e.g. after the knowledge base or classifier changed"""
+    global knowledge_version
+    knowledge_version = compute_knowledge_version()
+
+def get_result_cache_stats() -> Dict:
+    """Hit/miss counters of the result cache"""
+    stats = result_cache.stats()
+    stats["knowledge_version"] = knowledge_version
+    return stats
+
+def resolve_language(text: str, language: Optional[str]) -> str:
+    """Turn a requested language (or 'auto') into the language to answer in"""
+    if not language:
+        return 'en'
+    if language == 'auto':
+        with stage_timer('detect_language'):
+            return detect_language(text) or 'en'
+    return language
+
+def _prepare(text: str, language: str) -> Tuple[str, AnalysisContext]:
+    """Translate the question into English and build its analysis context"""
+    if language != 'en':
+        with stage_timer('translate_input'):
+            text = translate_text(text, language, 'en')
+    
+    # Lowercase and tokenize once for every model stage
+    return text, AnalysisContext(text)
+
+def _complete(text: str, language: str, context: AnalysisContext, domain: str) -> Dict:
+    """Run the stages that follow classification"""
+    with stage_timer('extract_entities'):
+        entities = extract_entities(context)
+    with stage_timer('answer_question'):
+        answer = answer_question(context, domain, language)
+        legal_references = get_legal_references(domain, language)
+    with stage_timer('search_legal_database'):
+        database_results = search_legal_database(domain, context)
+    
+    return {
+        "user_input": text,
+        "language": language,
+        "domain": domain,
+        "entities": get_entity_texts(entities),
+        "answer": answer,
+        "legal_references": legal_references,
+        "database_results": database_results
+    }
+
+def analyze(text: str, language: str = 'en') -> Dict:
+    """Run the full analysis pipeline over one question"""
+    text, context = _prepare(text, language)
+    with stage_timer('classify'):
+        domain = classify(context)
+    return _complete(text, language, context, domain)
+
+def _cache_lookup(text: str, requested_language: Optional[str]):
+    """(cache key, cached result or None) for a normalized question; the key is None when caching is off"""
+    cache = result_cache
+    if cache.max_bytes <= 0:
+        return None, None
+    key = (knowledge_version, translator.dictionary_generation(), qa.catalog_generation(),
+           text, requested_language or 'en')
+    result = cache.get(key)
+    RESULT_CACHE_LOOKUPS.labels('miss' if result is None else 'hit').inc()
+    return key, result
+
+def _cache_store(key, result: Dict):
+    if key is not None:
+        result_cache.put(key, result, len(json.dumps(result, ensure_ascii=False).encode('utf-8')))
+
+def analyze_request(text: str, requested_language: Optional[str] = 'en') -> Dict:
+    """Resolve the language and analyze, serving repeated questions from the result cache.
+
+    The returned dict may be shared with other callers and must not be modified.
+    """
+    text = normalize_input(text)
+    key, result = _cache_lookup(text, requested_language)
+    if result is None:
+        result = analyze(text, resolve_language(text, requested_language))
+        _cache_store(key, result)
+    return result
+
+def _parse_item(item) -> Tuple[str, Optional[str]]:
+    """Accept either a bare string or {"text": ..., "language": ...}"""
+    if isinstance(item, str):
+        return item, None
+    if isinstance(item, dict) and isinstance(item.get("text"), str):
+        language = item.get("language")
+        if language is not None and not isinstance(language, str):
+            raise ValueError("'language' must be a string")
+        return item["text"], language
+    raise ValueError("Each input must be a string or an object with a 'text' string")
+
+def _analyze_chunk(keys: List[Tuple[str, Optional[str]]]) -> Dict[Tuple[str, Optional[str]], Union[Dict, Exception]]:
+    """Analyze distinct (text, language) inputs, classifying the uncached ones in one call.
+
+    Inputs that fail map to an exception instead of a result.
+    """
+    outcomes: Dict[Tuple[str, Optional[str]], Union[Dict, Exception]] = {}
+    pending = []  # (input key, cache key, text, language, context)
+    for input_key in keys:
+        text, requested_language = input_key
+        try:
+            text = normalize_input(text)
+            cache_key, result = _cache_lookup(text, requested_language)
+            if result is not None:
+                outcomes[input_key] = result
+                continue
+            language = resolve_language(text, requested_language)
+            pending.append((input_key, cache_key, *_prepare(text, language), language))
+        except Exception as e:
+            outcomes[input_key] = e
+    if not pending:
+        return outcomes
+    
+    try:
+        with stage_timer('classify'):
+            domains = classify_many([context for _, _, _, context, _ in pending])
+    except Exception as e:
+        print(f"Batch classification error: {e}")
+        domains = [None] * len(pending)
+    
+    for (input_key, cache_key, text, context, language), domain in zip(pending, domains):
+        try:
+            if domain is None:
+                with stage_timer('classify'):
+                    domain = classify(context)
+            result = _complete(text, language, context, domain)
+            _cache_store(cache_key, result)
+            outcomes[input_key] = result
+        except Exception as e:
+            outcomes[input_key] = e
+    return outcomes
+
+def iter_analyze_batch(items: Iterable, default_language: Optional[str] = None) -> Iterator[Dict]:
+    """Analyze a batch of inputs, yielding one result per input in input order.
+
+    Results carry the input's ``index``; a bad input yields an ``error``
+    result instead of failing the batch. Inputs are processed in chunks of
+    ``BATCH_CHUNK_SIZE`` whose questions are classified with one
+    ``classify_many`` call. Identical (text, language) inputs are analyzed
+    once, and repeats of earlier requests come from the result cache.
+    """
+    outcomes: Dict[Tuple[str, Optional[str]], Union[Dict, Exception]] = {}
+    chunk = []  # (index, input key or parse error)
+    
+    def flush():
+        new_keys = list(dict.fromkeys(key for _, key in chunk if isinstance(key, tuple) and key not in outcomes))
+        outcomes.update(_analyze_chunk(new_keys))
+        for index, key in chunk:
+            if isinstance(key, ValueError):
+                yield {"index": index, "error": str(key)}
+                continue
+            result = outcomes[key]
+            if isinstance(result, ValueError):
+                yield {"index": index, "error": str(result)}
+            elif isinstance(result, Exception):
+                print(f"Analysis error: {result}")
+                yield {"index": index, "error": "Analysis failed"}
+            else:
+                yield dict(result, index=index)
+        chunk.clear()
+    
+    for index, item in enumerate(items):
+        try:
+            text, language = _parse_item(item)
+            chunk.append((index, (text, language or default_language)))
+        except ValueError as e:
+            chunk.append((index, e))
+        if len(chunk) >= BATCH_CHUNK_SIZE:
+            yield from flush()
+    yield from flush()
+
+def analyze_batch(items: Iterable, default_language: Optional[str] = None) -> List[Dict]:
+    """Analyze a batch of inputs and return the results in input order"""
+    return list(iter_analyze_batch(items, default_language))
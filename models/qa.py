@@ -1,442 +1,536 @@
 # models/qa.py
 
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List
 
-def answer_question(text: str, domain: str) -> str:
-    """Generate legal interpretation using knowledge base with actionable advice"""
-    
-    # Legal knowledge base for different domains with actionable steps
-    legal_knowledge = {
-        "Labor Law": {
-            "context": """
-            Employment law covers various aspects of the employer-employee relationship. 
-            Key rights include: protection against discrimination, right to fair wages, 
-            workplace safety, and protection from wrongful termination. 
-            Employees have the right to form unions and engage in collective bargaining.
-            """,
-            "rights": [
-                "Right to minimum wage and overtime pay",
-                "Protection against discrimination based on race, gender, age, disability",
-                "Right to a safe workplace",
-                "Protection from retaliation for reporting violations",
-                "Right to family and medical leave (FMLA)",
-                "Right to workers' compensation for workplace injuries"
-            ],
-            "situations": {
-                "fired": {
-                    "title": "Wrongful Termination",
-                    "immediate_actions": [
-                        "1. Request a written termination letter explaining the reason",
-                        "2. Collect all relevant documents (pay stubs, performance reviews, emails)",
-                        "3. Contact your state's Department of Labor",
-                        "4. Consider filing for unemployment benefits",
-                        "5. Consult with an employment attorney"
-                    ],
-                    "legal_options": [
-                        "File a complaint with the EEOC if discrimination is suspected",
-                        "File a wage claim if final pay is withheld",
-                        "Consider wrongful termination lawsuit if you have evidence",
-                        "Apply for unemployment benefits immediately"
-                    ],
-                    "resources": [
-                        "Equal Employment Opportunity Commission (EEOC)",
-                        "State Department of Labor",
-                        "Local legal aid organizations",
-                        "Employment law attorneys"
-                    ]
-                },
-                "discrimination": {
-                    "title": "Workplace Discrimination",
-                    "immediate_actions": [
-                        "1. Document all incidents with dates, times, and witnesses",
-                        "2. Report to HR in writing and keep copies",
-                        "3. Contact the EEOC within 180 days",
-                        "4. Consult with an employment attorney",
-                        "5. Consider filing a formal complaint"
-                    ],
-                    "legal_options": [
-                        "File EEOC complaint for federal protection",
-                        "File with state anti-discrimination agency",
-                        "Consider private lawsuit after EEOC process",
-                        "Seek injunctive relief to stop discrimination"
-                    ],
-                    "resources": [
-                        "EEOC - Equal Employment Opportunity Commission",
-                        "State civil rights agencies",
-                        "Employment discrimination attorneys",
-                        "Workplace rights organizations"
-                    ]
-                },
-                "harassment": {
-                    "title": "Workplace Harassment",
-                    "immediate_actions": [
-                        "1. Tell the harasser to stop (if safe to do so)",
-                        "2. Report to supervisor and HR in writing",
-                        "3. Document all incidents with details",
-                        "4. Contact the EEOC or state agency",
-                        "5. Consider legal action if employer doesn't act"
-                    ],
-                    "legal_options": [
-                        "File harassment complaint with EEOC",
-                        "File with state employment agency",
-                        "Consider private lawsuit for damages",
-                        "Seek restraining order if necessary"
-                    ],
-                    "resources": [
-                        "EEOC Harassment Information",
-                        "State employment agencies",
-                        "Workplace harassment attorneys",
-                        "Employee rights organizations"
-                    ]
-                }
+from .analysis import TextInput, as_context
+from .translator import get_translation_targets, translate_text
+from .utils import freeze
+
+# Legal knowledge base for different domains with actionable steps
+LEGAL_KNOWLEDGE = freeze({
+    "Labor Law": {
+        "context": """
+        Employment law covers various aspects of the employer-employee relationship. 
+        Key rights include: protection against discrimination, right to fair wages, 
+        workplace safety, and protection from wrongful termination. 
+        Employees have the right to form unions and engage in collective bargaining.
+        """,
+        "rights": [
+            "Right to minimum wage and overtime pay",
+            "Protection against discrimination based on race, gender, age, disability",
+            "Right to a safe workplace",
+            "Protection from retaliation for reporting violations",
+            "Right to family and medical leave (FMLA)",
+            "Right to workers' compensation for workplace injuries"
+        ],
+        "situations": {
+            "fired": {
+                "title": "Wrongful Termination",
+                "immediate_actions": [
+                    "1. Request a written termination letter explaining the reason",
+                    "2. Collect all relevant documents (pay stubs, performance reviews, emails)",
+                    "3. Contact your state's Department of Labor",
+                    "4. Consider filing for unemployment benefits",
+                    "5. Consult with an employment attorney"
+                ],
+                "legal_options": [
+                    "File a complaint with the EEOC if discrimination is suspected",
+                    "File a wage claim if final pay is withheld",
+                    "Consider wrongful termination lawsuit if you have evidence",
+                    "Apply for unemployment benefits immediately"
+                ],
+                "resources": [
+                    "Equal Employment Opportunity Commission (EEOC)",
+                    "State Department of Labor",
+                    "Local legal aid organizations",
+                    "Employment law attorneys"
+                ]
+            },
+            "discrimination": {
+                "title": "Workplace Discrimination",
+                "immediate_actions": [
+                    "1. Document all incidents with dates, times, and witnesses",
+                    "2. Report to HR in writing and keep copies",
+                    "3. Contact the EEOC within 180 days",
+                    "4. Consult with an employment attorney",
+                    "5. Consider filing a formal complaint"
+                ],
+                "legal_options": [
+                    "File EEOC complaint for federal protection",
+                    "File with state anti-discrimination agency",
+                    "Consider private lawsuit after EEOC process",
+                    "Seek injunctive relief to stop discrimination"
+                ],
+                "resources": [
+                    "EEOC - Equal Employment Opportunity Commission",
+                    "State civil rights agencies",
+                    "Employment discrimination attorneys",
+                    "Workplace rights organizations"
+                ]
+            },
+            "harassment": {
+                "title": "Workplace Harassment",
+                "immediate_actions": [
+                    "1. Tell the harasser to stop (if safe to do so)",
+                    "2. Report to supervisor and HR in writing",
+                    "3. Document all incidents with details",
+                    "4. Contact the EEOC or state agency",
+                    "5. Consider legal action if employer doesn't act"
+                ],
+                "legal_options": [
+                    "File harassment complaint with EEOC",
+                    "File with state employment agency",
+                    "Consider private lawsuit for damages",
+                    "Seek restraining order if necessary"
+                ],
+                "resources": [
+                    "EEOC Harassment Information",
+                    "State employment agencies",
+                    "Workplace harassment attorneys",
+                    "Employee rights organizations"
+                ]
             }
-        },
-        "Criminal Law": {
-            "context": """
-            Criminal law deals with offenses against the state or society. 
-            Defendants have constitutional rights including due process, 
-            right to counsel, right to remain silent, and protection from double jeopardy.
-            """,
-            "rights": [
-                "Right to remain silent (Fifth Amendment)",
-                "Right to legal counsel (Sixth Amendment)",
-                "Right to a speedy and public trial",
-                "Protection from unreasonable searches and seizures",
-                "Right to confront witnesses",
-                "Protection from cruel and unusual punishment"
-            ],
-            "situations": {
-                "arrested": {
-                    "title": "If You Are Arrested",
-                    "immediate_actions": [
-                        "1. Stay calm and do not resist arrest",
-                        "2. Exercise your right to remain silent",
-                        "3. Ask for a lawyer immediately",
-                        "4. Do not answer questions without legal counsel",
-                        "5. Remember: 'I want to speak to my lawyer'",
-                        "6. Do not consent to searches without a warrant"
-                    ],
-                    "legal_options": [
-                        "Request a public defender if you cannot afford an attorney",
-                        "File a motion to suppress if rights were violated",
-                        "Consider plea bargain negotiations",
-                        "Prepare for trial if pleading not guilty",
-                        "Appeal conviction if found guilty"
-                    ],
-                    "resources": [
-                        "Public Defender Services",
-                        "Local criminal defense attorneys",
-                        "Bail bond services",
-                        "Legal aid organizations"
-                    ]
-                },
-                "charged": {
-                    "title": "If You Are Charged with a Crime",
-                    "immediate_actions": [
-                        "1. Contact a criminal defense attorney immediately",
-                        "2. Do not discuss the case with anyone except your lawyer",
-                        "3. Gather all relevant documents and evidence",
-                        "4. Attend all court hearings",
-                        "5. Follow your attorney's advice"
-                    ],
-                    "legal_options": [
-                        "File pre-trial motions to dismiss or suppress evidence",
-                        "Negotiate plea agreement if appropriate",
-                        "Prepare for trial defense",
-                        "Consider alternative sentencing programs"
-                    ],
-                    "resources": [
-                        "Criminal defense attorneys",
-                        "Public defender office",
-                        "Legal aid organizations",
-                        "Court-appointed counsel"
-                    ]
-                }
+        }
+    },
+    "Criminal Law": {
+        "context": """
+        Criminal law deals with offenses against the state or society. 
+        Defendants have constitutional rights including due process, 
+        right to counsel, right to remain silent, and protection from double jeopardy.
+        """,
+        "rights": [
+            "Right to remain silent (Fifth Amendment)",
+            "Right to legal counsel (Sixth Amendment)",
+            "Right to a speedy and public trial",
+            "Protection from unreasonable searches and seizures",
+            "Right to confront witnesses",
+            "Protection from cruel and unusual punishment"
+        ],
+        "situations": {
+            "arrested": {
+                "title": "If You Are Arrested",
+                "immediate_actions": [
+                    "1. Stay calm and do not resist arrest",
+                    "2. Exercise your right to remain silent",
+                    "3. Ask for a lawyer immediately",
+                    "4. Do not answer questions without legal counsel",
+                    "5. Remember: 'I want to speak to my lawyer'",
+                    "6. Do not consent to searches without a warrant"
+                ],
+                "legal_options": [
+                    "Request a public defender if you cannot afford an attorney",
+                    "File a motion to suppress if rights were violated",
+                    "Consider plea bargain negotiations",
+                    "Prepare for trial if pleading not guilty",
+                    "Appeal conviction if found guilty"
+                ],
+                "resources": [
+                    "Public Defender Services",
+                    "Local criminal defense attorneys",
+                    "Bail bond services",
+                    "Legal aid organizations"
+                ]
+            },
+            "charged": {
+                "title": "If You Are Charged with a Crime",
+                "immediate_actions": [
+                    "1. Contact a criminal defense attorney immediately",
+                    "2. Do not discuss the case with anyone except your lawyer",
+                    "3. Gather all relevant documents and evidence",
+                    "4. Attend all court hearings",
+                    "5. Follow your attorney's advice"
+                ],
+                "legal_options": [
+                    "File pre-trial motions to dismiss or suppress evidence",
+                    "Negotiate plea agreement if appropriate",
+                    "Prepare for trial defense",
+                    "Consider alternative sentencing programs"
+                ],
+                "resources": [
+                    "Criminal defense attorneys",
+                    "Public defender office",
+                    "Legal aid organizations",
+                    "Court-appointed counsel"
+                ]
             }
-        },
-        "Civil Law": {
-            "context": """
-            Civil law governs disputes between individuals or organizations. 
-            It covers contracts, torts, property disputes, and personal injury cases.
-            Parties have the right to sue for damages and seek legal remedies.
-            """,
-            "rights": [
-                "Right to file a lawsuit",
-                "Right to legal representation",
-                "Right to discovery of evidence",
-                "Right to a jury trial in certain cases",
-                "Right to appeal decisions",
-                "Right to seek damages and injunctive relief"
-            ],
-            "situations": {
-                "contract_dispute": {
-                    "title": "Contract Dispute",
-                    "immediate_actions": [
-                        "1. Review the contract terms carefully",
-                        "2. Document all communications with the other party",
-                        "3. Send a demand letter outlining your position",
-                        "4. Consider mediation or arbitration",
-                        "5. Consult with a contract attorney"
-                    ],
-                    "legal_options": [
-                        "File breach of contract lawsuit",
-                        "Seek specific performance",
-                        "Request damages for breach",
-                        "Consider alternative dispute resolution"
-                    ],
-                    "resources": [
-                        "Contract law attorneys",
-                        "Mediation services",
-                        "Small claims court",
-                        "Legal aid organizations"
-                    ]
-                },
-                "personal_injury": {
-                    "title": "Personal Injury",
-                    "immediate_actions": [
-                        "1. Seek medical attention immediately",
-                        "2. Document the accident scene and injuries",
-                        "3. Collect witness statements and contact information",
-                        "4. Report to relevant authorities",
-                        "5. Contact a personal injury attorney"
-                    ],
-                    "legal_options": [
-                        "File personal injury lawsuit",
-                        "Negotiate settlement with insurance",
-                        "Seek compensation for medical expenses",
-                        "Request damages for pain and suffering"
-                    ],
-                    "resources": [
-                        "Personal injury attorneys",
-                        "Medical malpractice lawyers",
-                        "Insurance claim specialists",
-                        "Accident reconstruction experts"
-                    ]
-                }
+        }
+    },
+    "Civil Law": {
+        "context": """
+        Civil law governs disputes between individuals or organizations. 
+        It covers contracts, torts, property disputes, and personal injury cases.
+        Parties have the right to sue for damages and seek legal remedies.
+        """,
+        "rights": [
+            "Right to file a lawsuit",
+            "Right to legal representation",
+            "Right to discovery of evidence",
+            "Right to a jury trial in certain cases",
+            "Right to appeal decisions",
+            "Right to seek damages and injunctive relief"
+        ],
+        "situations": {
+            "contract_dispute": {
+                "title": "Contract Dispute",
+                "immediate_actions": [
+                    "1. Review the contract terms carefully",
+                    "2. Document all communications with the other party",
+                    "3. Send a demand letter outlining your position",
+                    "4. Consider mediation or arbitration",
+                    "5. Consult with a contract attorney"
+                ],
+                "legal_options": [
+                    "File breach of contract lawsuit",
+                    "Seek specific performance",
+                    "Request damages for breach",
+                    "Consider alternative dispute resolution"
+                ],
+                "resources": [
+                    "Contract law attorneys",
+                    "Mediation services",
+                    "Small claims court",
+                    "Legal aid organizations"
+                ]
+            },
+            "personal_injury": {
+                "title": "Personal Injury",
+                "immediate_actions": [
+                    "1. Seek medical attention immediately",
+                    "2. Document the accident scene and injuries",
+                    "3. Collect witness statements and contact information",
+                    "4. Report to relevant authorities",
+                    "5. Contact a personal injury attorney"
+                ],
+                "legal_options": [
+                    "File personal injury lawsuit",
+                    "Negotiate settlement with insurance",
+                    "Seek compensation for medical expenses",
+                    "Request damages for pain and suffering"
+                ],
+                "resources": [
+                    "Personal injury attorneys",
+                    "Medical malpractice lawyers",
+                    "Insurance claim specialists",
+                    "Accident reconstruction experts"
+                ]
             }
-        },
-        "Family Law": {
-            "context": """
-            Family law covers marriage, divorce, child custody, and domestic relations.
-            The best interests of the child are paramount in custody decisions.
-            """,
-            "rights": [
-                "Right to file for divorce",
-                "Right to seek child custody and support",
-                "Right to spousal support in appropriate cases",
-                "Right to visitation with children",
-                "Right to equitable division of marital property",
-                "Right to protection from domestic violence"
-            ],
-            "situations": {
-                "divorce": {
-                    "title": "Filing for Divorce",
-                    "immediate_actions": [
-                        "1. Consult with a family law attorney",
-                        "2. Gather financial documents (bank statements, tax returns)",
-                        "3. Document marital assets and debts",
-                        "4. Consider mediation for uncontested divorce",
-                        "5. File divorce petition in appropriate court"
-                    ],
-                    "legal_options": [
-                        "File for uncontested divorce if both parties agree",
-                        "File for contested divorce if disputes exist",
-                        "Seek temporary orders for support/custody",
-                        "Request property division and spousal support"
-                    ],
-                    "resources": [
-                        "Family law attorneys",
-                        "Divorce mediators",
-                        "Financial advisors",
-                        "Child custody evaluators"
-                    ]
-                },
-                "custody": {
-                    "title": "Child Custody Dispute",
-                    "immediate_actions": [
-                        "1. Document your involvement in child's life",
-                        "2. Keep records of all child-related expenses",
-                        "3. Consider mediation to resolve disputes",
-                        "4. File for custody modification if needed",
-                        "5. Consult with family law attorney"
-                    ],
-                    "legal_options": [
-                        "File for joint or sole custody",
-                        "Request visitation schedule modification",
-                        "Seek child support modification",
-                        "File for emergency custody if necessary"
-                    ],
-                    "resources": [
-                        "Family law attorneys",
-                        "Child custody mediators",
-                        "Parenting coordinators",
-                        "Child support enforcement agencies"
-                    ]
-                }
+        }
+    },
+    "Family Law": {
+        "context": """
+        Family law covers marriage, divorce, child custody, and domestic relations.
+        The best interests of the child are paramount in custody decisions.
+        """,
+        "rights": [
+            "Right to file for divorce",
+            "Right to seek child custody and support",
+            "Right to spousal support in appropriate cases",
+            "Right to visitation with children",
+            "Right to equitable division of marital property",
+            "Right to protection from domestic violence"
+        ],
+        "situations": {
+            "divorce": {
+                "title": "Filing for Divorce",
+                "immediate_actions": [
+                    "1. Consult with a family law attorney",
+                    "2. Gather financial documents (bank statements, tax returns)",
+                    "3. Document marital assets and debts",
+                    "4. Consider mediation for uncontested divorce",
+                    "5. File divorce petition in appropriate court"
+                ],
+                "legal_options": [
+                    "File for uncontested divorce if both parties agree",
+                    "File for contested divorce if disputes exist",
+                    "Seek temporary orders for support/custody",
+                    "Request property division and spousal support"
+                ],
+                "resources": [
+                    "Family law attorneys",
+                    "Divorce mediators",
+                    "Financial advisors",
+                    "Child custody evaluators"
+                ]
+            },
+            "custody": {
+                "title": "Child Custody Dispute",
+                "immediate_actions": [
+                    "1. Document your involvement in child's life",
+                    "2. Keep records of all child-related expenses",
+                    "3. Consider mediation to resolve disputes",
+                    "4. File for custody modification if needed",
+                    "5. Consult with family law attorney"
+                ],
+                "legal_options": [
+                    "File for joint or sole custody",
+                    "Request visitation schedule modification",
+                    "Seek child support modification",
+                    "File for emergency custody if necessary"
+                ],
+                "resources": [
+                    "Family law attorneys",
+                    "Child custody mediators",
+                    "Parenting coordinators",
+                    "Child support enforcement agencies"
+                ]
             }
-        },
-        "Property Law": {
-            "context": """
-            Property law governs ownership and use of real and personal property.
-            It includes landlord-tenant law, real estate transactions, and property rights.
-            """,
-            "rights": [
-                "Right to quiet enjoyment of property",
-                "Right to fair housing without discrimination",
-                "Right to proper notice before eviction",
-                "Right to habitable living conditions",
-                "Right to security deposit return",
-                "Right to privacy in rental property"
-            ],
-            "situations": {
-                "eviction": {
-                    "title": "Facing Eviction",
-                    "immediate_actions": [
-                        "1. Review your lease agreement carefully",
-                        "2. Check if eviction notice is legally valid",
-                        "3. Contact legal aid or tenant rights organization",
-                        "4. Consider negotiating with landlord",
-                        "5. File answer to eviction lawsuit if served"
-                    ],
-                    "legal_options": [
-                        "File motion to dismiss if notice is defective",
-                        "Request rent abatement for uninhabitable conditions",
-                        "Counter-sue for landlord violations",
-                        "Request emergency stay of eviction"
-                    ],
-                    "resources": [
-                        "Tenant rights organizations",
-                        "Legal aid housing attorneys",
-                        "Local housing authorities",
-                        "Tenant advocacy groups"
-                    ]
-                },
-                "landlord_dispute": {
-                    "title": "Landlord-Tenant Dispute",
-                    "immediate_actions": [
-                        "1. Document all communications with landlord",
-                        "2. Take photos of any property issues",
-                        "3. Send written notice of problems",
-                        "4. Contact local housing authority",
-                        "5. Consider legal action if necessary"
-                    ],
-                    "legal_options": [
-                        "File complaint with housing authority",
-                        "Sue for return of security deposit",
-                        "Request rent abatement for repairs",
-                        "File for emergency repairs if needed"
-                    ],
-                    "resources": [
-                        "Housing authority",
-                        "Tenant rights attorneys",
-                        "Local tenant organizations",
-                        "Building code enforcement"
-                    ]
-                }
+        }
+    },
+    "Property Law": {
+        "context": """
+        Property law governs ownership and use of real and personal property.
+        It includes landlord-tenant law, real estate transactions, and property rights.
+        """,
+        "rights": [
+            "Right to quiet enjoyment of property",
+            "Right to fair housing without discrimination",
+            "Right to proper notice before eviction",
+            "Right to habitable living conditions",
+            "Right to security deposit return",
+            "Right to privacy in rental property"
+        ],
+        "situations": {
+            "eviction": {
+                "title": "Facing Eviction",
+                "immediate_actions": [
+                    "1. Review your lease agreement carefully",
+                    "2. Check if eviction notice is legally valid",
+                    "3. Contact legal aid or tenant rights organization",
+                    "4. Consider negotiating with landlord",
+                    "5. File answer to eviction lawsuit if served"
+                ],
+                "legal_options": [
+                    "File motion to dismiss if notice is defective",
+                    "Request rent abatement for uninhabitable conditions",
+                    "Counter-sue for landlord violations",
+                    "Request emergency stay of eviction"
+                ],
+                "resources": [
+                    "Tenant rights organizations",
+                    "Legal aid housing attorneys",
+                    "Local housing authorities",
+                    "Tenant advocacy groups"
+                ]
+            },
+            "landlord_dispute": {
+                "title": "Landlord-Tenant Dispute",
+                "immediate_actions": [
+                    "1. Document all communications with landlord",
+                    "2. Take photos of any property issues",
+                    "3. Send written notice of problems",
+                    "4. Contact local housing authority",
+                    "5. Consider legal action if necessary"
+                ],
+                "legal_options": [
+                    "File complaint with housing authority",
+                    "Sue for return of security deposit",
+                    "Request rent abatement for repairs",
+                    "File for emergency repairs if needed"
+                ],
+                "resources": [
+                    "Housing authority",
+                    "Tenant rights attorneys",
+                    "Local tenant organizations",
+                    "Building code enforcement"
+                ]
             }
         }
     }
-    
-    # Get domain-specific knowledge
-    domain_knowledge = legal_knowledge.get(domain, legal_knowledge["Civil Law"])
-    
-    # Generate contextual response based on the input text
-    response = generate_actionable_advice(text, domain_knowledge, domain)
-    
-    return response
+})
 
-def generate_actionable_advice(text: str, knowledge: Dict, domain: str) -> str:
-    """Generate actionable legal advice based on specific situations"""
-    
-    # Analyze the input text for key issues
-    text_lower = text.lower()
-    
-    # Identify specific legal situations
-    situations = {}
-    
+# Trigger words for each situation, in the order their advice is rendered
+SITUATION_TRIGGERS = (
     # Labor Law situations
-    if any(word in text_lower for word in ["fired", "terminated", "laid off"]):
-        situations["fired"] = knowledge["situations"]["fired"]
-    if any(word in text_lower for word in ["discrimination", "harassment"]):
-        situations["discrimination"] = knowledge["situations"]["discrimination"]
-    if any(word in text_lower for word in ["harassment", "harassed"]):
-        situations["harassment"] = knowledge["situations"]["harassment"]
-    
+    ("fired", ("fired", "terminated", "laid off")),
+    ("discrimination", ("discrimination", "harassment")),
+    ("harassment", ("harassment", "harassed")),
     # Criminal Law situations
-    if any(word in text_lower for word in ["arrested", "arrest"]):
-        situations["arrested"] = knowledge["situations"]["arrested"]
-    if any(word in text_lower for word in ["charged", "criminal", "crime"]):
-        situations["charged"] = knowledge["situations"]["charged"]
-    
+    ("arrested", ("arrested", "arrest")),
+    ("charged", ("charged", "criminal", "crime")),
     # Family Law situations
-    if any(word in text_lower for word in ["divorce", "divorced"]):
-        situations["divorce"] = knowledge["situations"]["divorce"]
-    if any(word in text_lower for word in ["custody", "child", "children"]):
-        situations["custody"] = knowledge["situations"]["custody"]
-    
+    ("divorce", ("divorce", "divorced")),
+    ("custody", ("custody", "child", "children")),
     # Property Law situations
-    if any(word in text_lower for word in ["eviction", "evicted"]):
-        situations["eviction"] = knowledge["situations"]["eviction"]
-    if any(word in text_lower for word in ["landlord", "rent", "lease"]):
-        situations["landlord_dispute"] = knowledge["situations"]["landlord_dispute"]
-    
-    # Generate comprehensive response
-    response_parts = []
-    response_parts.append(f"Based on your situation involving {domain.lower()}, here's what you need to know:")
-    
-    # Add general rights
-    response_parts.append(f"\n📋 YOUR LEGAL RIGHTS:")
+    ("eviction", ("eviction", "evicted")),
+    ("landlord_dispute", ("landlord", "rent", "lease"))
+)
+
+_SITUATION_ORDER = {key: position for position, (key, _) in enumerate(SITUATION_TRIGGERS)}
+
+DISCLAIMER = "\n⚠️ IMPORTANT: This information is for guidance only. Please consult with a qualified attorney for specific legal advice tailored to your situation."
+
+LEGAL_REFERENCES = freeze({
+    "Labor Law": [
+        "Title VII of the Civil Rights Act of 1964",
+        "Fair Labor Standards Act (FLSA)",
+        "Americans with Disabilities Act (ADA)",
+        "Family and Medical Leave Act (FMLA)"
+    ],
+    "Criminal Law": [
+        "U.S. Constitution (Bill of Rights)",
+        "Miranda v. Arizona (1966)",
+        "Gideon v. Wainwright (1963)"
+    ],
+    "Civil Law": [
+        "State civil procedure rules",
+        "Contract law principles",
+        "Tort law standards"
+    ],
+    "Family Law": [
+        "State family law statutes",
+        "Uniform Child Custody Jurisdiction Act",
+        "Child Support Guidelines"
+    ],
+    "Property Law": [
+        "Fair Housing Act",
+        "State landlord-tenant laws",
+        "Real estate transaction laws"
+    ]
+})
+
+DEFAULT_REFERENCES = ("Consult local laws and regulations",)
+
+def _render_rights(knowledge: Dict) -> str:
+    """Render the general rights section of an answer"""
+    response_parts = [f"\n📋 YOUR LEGAL RIGHTS:"]
     for right in knowledge["rights"][:4]:
         response_parts.append(f"• {right}")
+    return "\n".join(response_parts)
+
+def _render_situation(situation_data: Dict) -> str:
+    """Render the advice section for one specific situation"""
+    response_parts = [f"\n🚨 IMMEDIATE ACTIONS - {situation_data['title']}:"]
+    for action in situation_data["immediate_actions"]:
+        response_parts.append(action)
     
-    # Add specific situation advice
-    if situations:
-        for situation_key, situation_data in situations.items():
-            response_parts.append(f"\n🚨 IMMEDIATE ACTIONS - {situation_data['title']}:")
-            for action in situation_data["immediate_actions"]:
-                response_parts.append(action)
-            
-            response_parts.append(f"\n⚖️ LEGAL OPTIONS:")
-            for option in situation_data["legal_options"]:
-                response_parts.append(f"• {option}")
-            
-            response_parts.append(f"\n📞 HELPFUL RESOURCES:")
-            for resource in situation_data["resources"]:
-                response_parts.append(f"• {resource}")
-    
-    response_parts.append(f"\n⚠️ IMPORTANT: This information is for guidance only. Please consult with a qualified attorney for specific legal advice tailored to your situation.")
+    response_parts.append(f"\n⚖️ LEGAL OPTIONS:")
+    for option in situation_data["legal_options"]:
+        response_parts.append(f"• {option}")
     
+    response_parts.append(f"\n📞 HELPFUL RESOURCES:")
+    for resource in situation_data["resources"]:
+        response_parts.append(f"• {resource}")
     return "\n".join(response_parts)
 
-def get_legal_references(domain: str) -> List[str]:
-    """Get relevant legal references for the domain"""
-    references = {
-        "Labor Law": [
-            "Title VII of the Civil Rights Act of 1964",
-            "Fair Labor Standards Act (FLSA)",
-            "Americans with Disabilities Act (ADA)",
-            "Family and Medical Leave Act (FMLA)"
-        ],
-        "Criminal Law": [
-            "U.S. Constitution (Bill of Rights)",
-            "Miranda v. Arizona (1966)",
-            "Gideon v. Wainwright (1963)"
-        ],
-        "Civil Law": [
-            "State civil procedure rules",
-            "Contract law principles",
-            "Tort law standards"
-        ],
-        "Family Law": [
-            "State family law statutes",
-            "Uniform Child Custody Jurisdiction Act",
-            "Child Support Guidelines"
-        ],
-        "Property Law": [
-            "Fair Housing Act",
-            "State landlord-tenant laws",
-            "Real estate transaction laws"
-        ]
+# Answer fragments rendered once per domain and per (domain, situation) pair
+_RIGHTS_FRAGMENTS = {
+    domain: _render_rights(knowledge) for domain, knowledge in LEGAL_KNOWLEDGE.items()
+}
+_SITUATION_FRAGMENTS = {
+    (domain, situation_key): _render_situation(situation_data)
+    for domain, knowledge in LEGAL_KNOWLEDGE.items()
+    for situation_key, situation_data in knowledge["situations"].items()
+}
+
+# Domain labels the classifier can return, including its fallback
+ANSWER_DOMAINS = tuple(LEGAL_KNOWLEDGE) + ("General Law",)
+
+def _answer_header(domain: str) -> str:
+    return f"Based on your situation involving {domain.lower()}, here's what you need to know:"
+
+def _build_catalog(language: str) -> Dict:
+    """Render every answer fragment and reference into one language"""
+    if language == 'en':
+        localize = lambda text: text
+    else:
+        localize = lambda text: translate_text(text, 'en', language)
+    return {
+        "headers": {domain: localize(_answer_header(domain)) for domain in ANSWER_DOMAINS},
+        "rights": {domain: localize(fragment) for domain, fragment in _RIGHTS_FRAGMENTS.items()},
+        "situations": {key: localize(fragment) for key, fragment in _SITUATION_FRAGMENTS.items()},
+        "disclaimer": localize(DISCLAIMER),
+        "references": {
+            domain: tuple(localize(reference) for reference in references)
+            for domain, references in LEGAL_REFERENCES.items()
+        },
+        "default_references": tuple(localize(reference) for reference in DEFAULT_REFERENCES)
     }
+
+def build_answer_catalogs() -> Dict[str, Dict]:
+    """Per-language answer catalogs for English and every language with a dictionary"""
+    return {language: _build_catalog(language) for language in ['en'] + get_translation_targets('en')}
+
+# Answers are assembled from these, so no translation happens per request
+ANSWER_CATALOGS = build_answer_catalogs()
+
+# Bumped by every rebuild so caches of rendered answers can tell them apart
+_catalog_generation = 0
+
+def rebuild_answer_catalogs():
+    """Re-render the catalogs, e.g. after the translation dictionaries changed"""
+    global ANSWER_CATALOGS, _catalog_generation
+    ANSWER_CATALOGS = build_answer_catalogs()
+    _catalog_generation += 1
+    _render_answer.cache_clear()
+
+def catalog_generation() -> int:
+    """Counter bumped by every rebuild_answer_catalogs() call"""
+    return _catalog_generation
+
+def _catalog(language: str) -> Dict:
+    # Languages without a dictionary were always answered in English
+    return ANSWER_CATALOGS.get(language) or ANSWER_CATALOGS['en']
+
+def _knowledge_domain(domain: str) -> str:
+    """Knowledge base entry used for a domain, falling back to Civil Law"""
+    return domain if domain in LEGAL_KNOWLEDGE else "Civil Law"
+
+def detect_situations(text: TextInput) -> FrozenSet[str]:
+    """Identify the specific legal situations mentioned in the text"""
+    text_lower = as_context(text).lower
+    return frozenset(
+        situation_key for situation_key, triggers in SITUATION_TRIGGERS
+        if any(word in text_lower for word in triggers)
+    )
+
+def _assemble_answer(header: str, rights_fragment: str, situation_fragments: Iterable[str],
+                     disclaimer: str = DISCLAIMER) -> str:
+    """Join rendered fragments into the final answer text"""
+    response_parts = [header]
+    response_parts.append(rights_fragment)
+    response_parts.extend(situation_fragments)
+    response_parts.append(disclaimer)
+    return "\n".join(response_parts)
+
+@lru_cache(maxsize=512)
+def _render_answer(domain: str, situations: FrozenSet[str], language: str = 'en') -> str:
+    """Assemble a full answer from the precomputed fragments of one language"""
+    catalog = _catalog(language)
+    knowledge_domain = _knowledge_domain(domain)
+    header = catalog["headers"].get(domain)
+    if header is None:
+        header = _answer_header(domain)
+        if language in ANSWER_CATALOGS and language != 'en':
+            header = translate_text(header, 'en', language)
+    situation_fragments = [
+        catalog["situations"][(knowledge_domain, situation_key)]
+        for situation_key in sorted(situations, key=_SITUATION_ORDER.get)
+        if (knowledge_domain, situation_key) in catalog["situations"]
+    ]
+    return _assemble_answer(header, catalog["rights"][knowledge_domain], situation_fragments,
+                            catalog["disclaimer"])
+
+def answer_question(text: TextInput, domain: str, language: str = 'en') -> str:
+    """Generate legal interpretation using knowledge base with actionable advice"""
+    return _render_answer(domain, detect_situations(text), language)
+
+def generate_actionable_advice(text: TextInput, knowledge: Dict, domain: str) -> str:
+    """Generate actionable legal advice based on specific situations"""
+    situations = detect_situations(text)
     
-    return references.get(domain, ["Consult local laws and regulations"]) 
\ No newline at end of file
+    # The built-in knowledge base is served from the rendered-answer cache
+    if knowledge is LEGAL_KNOWLEDGE[_knowledge_domain(domain)]:
+        return _render_answer(domain, situations)
+    
+    situation_fragments = [
+        _render_situation(knowledge["situations"][situation_key])
+        for situation_key in sorted(situations, key=_SITUATION_ORDER.get)
+        if situation_key in knowledge["situations"]
+    ]
+    return _assemble_answer(_answer_header(domain), _render_rights(knowledge), situation_fragments)
+
+def get_legal_references(domain: str, language: str = 'en') -> List[str]:
+    """Get relevant legal references for the domain"""
+    catalog = _catalog(language)
+    return list(catalog["references"].get(domain, catalog["default_references"]))
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+class SessionStore:
+    """Thread-safe per-session map with an LRU capacity limit and idle expiry.
+
+    Entries are kept in least-recently-used order, so both capacity eviction
+    and idle-TTL expiry only ever look at the oldest end of the map.
+    """
+
+    def __init__(self, capacity: int = 10000, ttl: Optional[float] = 1800.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # session_id -> (value, last access time)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expire(self, now: float):
+        if self.ttl is None:
+            return
+        while self._entries:
+            session_id, (_, last_access) = next(iter(self._entries.items()))
+            if now - last_access < self.ttl:
+                break
+            del self._entries[session_id]
+            self.expirations += 1
+
+    def _lookup(self, session_id: str, now: float):
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries[session_id] = (entry[0], now)
+        self._entries.move_to_end(session_id)
+        return entry[0]
+
+    def _store(self, session_id: str, value: Any, now: float):
+        self._entries[session_id] = (value, now)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        """Return a live session's value and mark it as recently used"""
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            value = self._lookup(session_id, now)
+            return default if value is None else value
+
+    def get_or_create(self, session_id: str, factory: Callable[[], Any]) -> Any:
+        """Return a live session's value, creating it with ``factory`` if needed"""
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            value = self._lookup(session_id, now)
+            if value is None:
+                value = factory()
+                self._store(session_id, value, now)
+            return value
+
+    def set(self, session_id: str, value: Any):
+        """Store a session's value, evicting the least recently used if full"""
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._store(session_id, value, now)
+
+    def pop(self, session_id: str, default: Any = None) -> Any:
+        """Remove a session and return its value"""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            return default if entry is None else entry[0]
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            self._expire(self._clock())
+            return session_id in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(self._clock())
+            return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Counters for monitoring session churn and memory"""
+        with self._lock:
+            self._expire(self._clock())
+            return {
+                "live_sessions": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
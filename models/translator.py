@@ -1,5 +1,164 @@
-from langdetect import detect
-from typing import Optional
+import hashlib
+import re
+from typing import Callable, Dict, List
+
+from .cache import LRUCache
+from .language_detection import detect_language
+
+# Number of translated strings memoized by translate_text
+TRANSLATION_CACHE_SIZE = 4096
+
+# Simple translation dictionary for common legal terms
+TRANSLATIONS = {
+    'en': {
+        'es': {
+            'rights': 'derechos',
+            'law': 'ley',
+            'legal': 'legal',
+            'employment': 'empleo',
+            'work': 'trabajo',
+            'fired': 'despedido',
+            'discrimination': 'discriminación',
+            'harassment': 'acoso',
+            'wage': 'salario',
+            'overtime': 'horas extra',
+            'safety': 'seguridad',
+            'termination': 'terminación',
+            'contract': 'contrato',
+            'court': 'tribunal',
+            'judge': 'juez',
+            'attorney': 'abogado',
+            'lawsuit': 'demanda',
+            'damages': 'daños',
+            'compensation': 'compensación',
+            'divorce': 'divorcio',
+            'custody': 'custodia',
+            'child support': 'manutención infantil',
+            'property': 'propiedad',
+            'landlord': 'propietario',
+            'tenant': 'inquilino',
+            'rent': 'alquiler',
+            'eviction': 'desalojo'
+        },
+        'fr': {
+            'rights': 'droits',
+            'law': 'loi',
+            'legal': 'légal',
+            'employment': 'emploi',
+            'work': 'travail',
+            'fired': 'licencié',
+            'discrimination': 'discrimination',
+            'harassment': 'harcèlement',
+            'wage': 'salaire',
+            'overtime': 'heures supplémentaires',
+            'safety': 'sécurité',
+            'termination': 'licenciement',
+            'contract': 'contrat',
+            'court': 'tribunal',
+            'judge': 'juge',
+            'attorney': 'avocat',
+            'lawsuit': 'procès',
+            'damages': 'dommages',
+            'compensation': 'compensation',
+            'divorce': 'divorce',
+            'custody': 'garde',
+            'child support': 'pension alimentaire',
+            'property': 'propriété',
+            'landlord': 'propriétaire',
+            'tenant': 'locataire',
+            'rent': 'loyer',
+            'eviction': 'expulsion'
+        },
+        'de': {
+            'rights': 'Rechte',
+            'law': 'Gesetz',
+            'legal': 'rechtlich',
+            'employment': 'Beschäftigung',
+            'work': 'Arbeit',
+            'fired': 'gekündigt',
+            'discrimination': 'Diskriminierung',
+            'harassment': 'Belästigung',
+            'wage': 'Lohn',
+            'overtime': 'Überstunden',
+            'safety': 'Sicherheit',
+            'termination': 'Kündigung',
+            'contract': 'Vertrag',
+            'court': 'Gericht',
+            'judge': 'Richter',
+            'attorney': 'Anwalt',
+            'lawsuit': 'Klage',
+            'damages': 'Schadensersatz',
+            'compensation': 'Entschädigung',
+            'divorce': 'Scheidung',
+            'custody': 'Sorgerecht',
+            'child support': 'Kindesunterhalt',
+            'property': 'Eigentum',
+            'landlord': 'Vermieter',
+            'tenant': 'Mieter',
+            'rent': 'Miete',
+            'eviction': 'Räumung'
+        }
+    }
+}
+
+def _match_case(source: str, translated: str) -> str:
+    """Carry the capitalisation of the matched source word over to its translation"""
+    if source.islower():
+        return translated
+    if source.isupper():
+        return translated.upper()
+    if source.istitle():
+        return translated.title()
+    return translated
+
+def _build_translator(lang_dict: Dict[str, str]) -> Callable[[str], str]:
+    """Compile a dictionary into a single-pass, word-bounded replacer"""
+    lookup = {source.lower(): translated for source, translated in lang_dict.items()}
+    # Longest first so phrases such as "child support" win over "child"
+    terms = sorted(lookup, key=len, reverse=True)
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE)
+    
+    def replace(match):
+        source = match.group()
+        return _match_case(source, lookup[source.lower()])
+    
+    return lambda text: pattern.sub(replace, text)
+
+def _build_translators() -> Dict:
+    """Compiled replacer per (source, target) language pair"""
+    return {
+        (source_lang, target_lang): _build_translator(lang_dict)
+        for source_lang, targets in TRANSLATIONS.items()
+        for target_lang, lang_dict in targets.items()
+    }
+
+_TRANSLATORS = _build_translators()
+
+# Translations keyed by (text digest, source, target, dictionary generation);
+# answers and legal references repeat verbatim across requests
+_translation_cache = LRUCache(TRANSLATION_CACHE_SIZE)
+_dictionary_generation = 0
+
+def rebuild_translators():
+    """Recompile the replacers after TRANSLATIONS changed and drop stale results"""
+    global _TRANSLATORS, _dictionary_generation
+    _TRANSLATORS = _build_translators()
+    # Bumping the generation keeps results computed concurrently with the
+    # old dictionaries from ever being served
+    _dictionary_generation += 1
+    _translation_cache.clear()
+
+def dictionary_generation() -> int:
+    """Counter bumped by every rebuild_translators() call"""
+    return _dictionary_generation
+
+def clear_translation_cache():
+    """Drop every memoized translation"""
+    _translation_cache.clear()
+
+def get_translation_cache_stats() -> Dict:
+    """Hit/miss counters for the translation memo"""
+    return _translation_cache.stats()
 
 def translate_text(text: str, source_lang: str, target_lang: str) -> str:
     """Translate text between languages using a simple dictionary approach"""
@@ -7,107 +166,20 @@ def translate_text(text: str, source_lang: str, target_lang: str) -> str:
         if source_lang == target_lang:
             return text
         
-        # Simple translation dictionary for common legal terms
-        translations = {
-            'en': {
-                'es': {
-                    'rights': 'derechos',
-                    'law': 'ley',
-                    'legal': 'legal',
-                    'employment': 'empleo',
-                    'work': 'trabajo',
-                    'fired': 'despedido',
-                    'discrimination': 'discriminación',
-                    'harassment': 'acoso',
-                    'wage': 'salario',
-                    'overtime': 'horas extra',
-                    'safety': 'seguridad',
-                    'termination': 'terminación',
-                    'contract': 'contrato',
-                    'court': 'tribunal',
-                    'judge': 'juez',
-                    'attorney': 'abogado',
-                    'lawsuit': 'demanda',
-                    'damages': 'daños',
-                    'compensation': 'compensación',
-                    'divorce': 'divorcio',
-                    'custody': 'custodia',
-                    'child support': 'manutención infantil',
-                    'property': 'propiedad',
-                    'landlord': 'propietario',
-                    'tenant': 'inquilino',
-                    'rent': 'alquiler',
-                    'eviction': 'desalojo'
-                },
-                'fr': {
-                    'rights': 'droits',
-                    'law': 'loi',
-                    'legal': 'légal',
-                    'employment': 'emploi',
-                    'work': 'travail',
-                    'fired': 'licencié',
-                    'discrimination': 'discrimination',
-                    'harassment': 'harcèlement',
-                    'wage': 'salaire',
-                    'overtime': 'heures supplémentaires',
-                    'safety': 'sécurité',
-                    'termination': 'licenciement',
-                    'contract': 'contrat',
-                    'court': 'tribunal',
-                    'judge': 'juge',
-                    'attorney': 'avocat',
-                    'lawsuit': 'procès',
-                    'damages': 'dommages',
-                    'compensation': 'compensation',
-                    'divorce': 'divorce',
-                    'custody': 'garde',
-                    'child support': 'pension alimentaire',
-                    'property': 'propriété',
-                    'landlord': 'propriétaire',
-                    'tenant': 'locataire',
-                    'rent': 'loyer',
-                    'eviction': 'expulsion'
-                },
-                'de': {
-                    'rights': 'Rechte',
-                    'law': 'Gesetz',
-                    'legal': 'rechtlich',
-                    'employment': 'Beschäftigung',
-                    'work': 'Arbeit',
-                    'fired': 'gekündigt',
-                    'discrimination': 'Diskriminierung',
-                    'harassment': 'Belästigung',
-                    'wage': 'Lohn',
-                    'overtime': 'Überstunden',
-                    'safety': 'Sicherheit',
-                    'termination': 'Kündigung',
-                    'contract': 'Vertrag',
-                    'court': 'Gericht',
-                    'judge': 'Richter',
-                    'attorney': 'Anwalt',
-                    'lawsuit': 'Klage',
-                    'damages': 'Schadensersatz',
-                    'compensation': 'Entschädigung',
-                    'divorce': 'Scheidung',
-                    'custody': 'Sorgerecht',
-                    'child support': 'Kindesunterhalt',
-                    'property': 'Eigentum',
-                    'landlord': 'Vermieter',
-                    'tenant': 'Mieter',
-                    'rent': 'Miete',
-                    'eviction': 'Räumung'
-                }
-            }
-        }
-        
-        # Get translation dictionary for the language pair
-        lang_dict = translations.get(source_lang, {}).get(target_lang, {})
+        # Get the compiled replacer for the language pair (generation first, so
+        # a concurrent rebuild can never file old output under the new one)
+        generation = _dictionary_generation
+        translator = _TRANSLATORS.get((source_lang, target_lang))
+        if translator is None:
+            return text
         
-        # Simple word-by-word translation
-        translated_text = text
-        for english_word, translated_word in lang_dict.items():
-            translated_text = translated_text.replace(english_word, translated_word)
-            translated_text = translated_text.replace(english_word.title(), translated_word.title())
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        key = (digest, source_lang, target_lang, generation)
+        translated_text = _translation_cache.get(key)
+        if translated_text is None:
+            # Word-by-word translation in a single pass over the text
+            translated_text = translator(text)
+            _translation_cache.put(key, translated_text)
         
         return translated_text
         
@@ -115,15 +187,6 @@ def translate_text(text: str, source_lang: str, target_lang: str) -> str:
         print(f"Translation error: {e}")
         return text
 
-def detect_language(text: str) -> Optional[str]:
-    """Detect the language of input text"""
-    try:
-        detected = detect(text)
-        return detected
-    except Exception as e:
-        print(f"Language detection error: {e}")
-        return None
-
 def get_supported_languages() -> dict:
     """Get list of supported languages"""
     return {
@@ -149,49 +212,54 @@ def get_supported_languages() -> dict:
         'fi': 'Finnish'
     }
 
+# Domain names in each language, looked up by translate_legal_terms
+LEGAL_TERMS = {
+    'Labor Law': {
+        'en': 'Labor Law',
+        'es': 'Derecho Laboral',
+        'fr': 'Droit du Travail',
+        'de': 'Arbeitsrecht',
+        'it': 'Diritto del Lavoro',
+        'pt': 'Direito do Trabalho'
+    },
+    'Criminal Law': {
+        'en': 'Criminal Law',
+        'es': 'Derecho Penal',
+        'fr': 'Droit Pénal',
+        'de': 'Strafrecht',
+        'it': 'Diritto Penale',
+        'pt': 'Direito Penal'
+    },
+    'Civil Law': {
+        'en': 'Civil Law',
+        'es': 'Derecho Civil',
+        'fr': 'Droit Civil',
+        'de': 'Zivilrecht',
+        'it': 'Diritto Civile',
+        'pt': 'Direito Civil'
+    },
+    'Family Law': {
+        'en': 'Family Law',
+        'es': 'Derecho de Familia',
+        'fr': 'Droit de la Famille',
+        'de': 'Familienrecht',
+        'it': 'Diritto di Famiglia',
+        'pt': 'Direito de Família'
+    },
+    'Property Law': {
+        'en': 'Property Law',
+        'es': 'Derecho de Propiedad',
+        'fr': 'Droit de la Propriété',
+        'de': 'Eigentumsrecht',
+        'it': 'Diritto di Proprietà',
+        'pt': 'Direito de Propriedade'
+    }
+}
+
+def get_translation_targets(source_lang: str = 'en') -> List[str]:
+    """Languages that have a dictionary for translating from source_lang"""
+    return list(TRANSLATIONS.get(source_lang, {}))
+
 def translate_legal_terms(domain: str, target_lang: str) -> str:
     """Translate legal domain-specific terms"""
-    legal_terms = {
-        'Labor Law': {
-            'en': 'Labor Law',
-            'es': 'Derecho Laboral',
-            'fr': 'Droit du Travail',
-            'de': 'Arbeitsrecht',
-            'it': 'Diritto del Lavoro',
-            'pt': 'Direito do Trabalho'
-        },
-        'Criminal Law': {
-            'en': 'Criminal Law',
-            'es': 'Derecho Penal',
-            'fr': 'Droit Pénal',
-            'de': 'Strafrecht',
-            'it': 'Diritto Penale',
-            'pt': 'Direito Penal'
-        },
-        'Civil Law': {
-            'en': 'Civil Law',
-            'es': 'Derecho Civil',
-            'fr': 'Droit Civil',
-            'de': 'Zivilrecht',
-            'it': 'Diritto Civile',
-            'pt': 'Direito Civil'
-        },
-        'Family Law': {
-            'en': 'Family Law',
-            'es': 'Derecho de Familia',
-            'fr': 'Droit de la Famille',
-            'de': 'Familienrecht',
-            'it': 'Diritto di Famiglia',
-            'pt': 'Direito de Família'
-        },
-        'Property Law': {
-            'en': 'Property Law',
-            'es': 'Derecho de Propiedad',
-            'fr': 'Droit de la Propriété',
-            'de': 'Eigentumsrecht',
-            'it': 'Diritto di Proprietà',
-            'pt': 'Direito de Propriedade'
-        }
-    }
-    
-    return legal_terms.get(domain, {}).get(target_lang, domain) 
\ No newline at end of file
+    return LEGAL_TERMS.get(domain, {}).get(target_lang, domain) 
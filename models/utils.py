@@ -0,0 +1,10 @@
+from types import MappingProxyType
+from typing import Any
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into read-only mappings and tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
@@ -0,0 +1,67 @@
+"""Compare keyword classification against the original per-domain loop.
+
+    python scripts/benchmark_classifier.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.analysis import AnalysisContext
+from models.classifier import DOMAIN_KEYWORDS, KEYWORD_WEIGHTS, classify
+
+SHORT_INPUTS = [
+    "I was fired from my job after reporting harassment",
+    "My landlords are evicting me",
+    "The police arrested me without a search warrant",
+    "We are filing for divorce and need a custody arrangement",
+    "Contracts were breached",
+]
+
+def baseline_classify(text: str) -> str:
+    """The classifier as it was before the keyword table was precomputed"""
+    text_lower = text.lower()
+    domain_scores = {}
+    for domain, keywords in DOMAIN_KEYWORDS.items():
+        score = 0
+        for keyword in keywords:
+            if keyword in text_lower:
+                score += KEYWORD_WEIGHTS.get(keyword, 1)
+        domain_scores[domain] = score
+    if max(domain_scores.values()) > 0:
+        return max(domain_scores, key=domain_scores.get)
+    return "General Law"
+
+def _time(func, inputs, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in inputs:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _with_tokens(prepared: AnalysisContext) -> AnalysisContext:
+    """A fresh context reusing tokens already built, as by the other pipeline stages"""
+    context = AnalysisContext(prepared.text)
+    for name in ("lower", "tokens", "token_set"):
+        context.__dict__[name] = getattr(prepared, name)
+    return context
+
+def main():
+    short = SHORT_INPUTS * 1000
+    document = [" ".join(SHORT_INPUTS) * 3000]
+    print(f"{'workload':<36} {'baseline s':>11} {'current s':>10}")
+    for name, inputs in (("5000 short calls", short), (f"{len(document[0]) // 1024} KB document", document)):
+        assert [baseline_classify(text) for text in inputs[:5]] == [classify(text) for text in inputs[:5]]
+        print(f"{name:<36} {_time(baseline_classify, inputs):>11.4f} {_time(classify, inputs):>10.4f}")
+    
+    # In the pipeline, the context's tokens are shared with the database search
+    prepared = [AnalysisContext(text) for text in document]
+    print(f"{'same document, tokens shared':<36} {_time(baseline_classify, document):>11.4f} "
+          f"{_time(lambda context: classify(_with_tokens(context)), prepared):>10.4f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compare entity extraction against the original per-pattern, per-keyword scans.
+
+    python scripts/benchmark_ner.py
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.ner import LEGAL_KEYWORDS, LEGAL_PATTERNS, extract_entities, extract_entities_many
+
+SAMPLES = [
+    "John Smith Corp hired an attorney to appeal the verdict.",
+    "The District Court heard the motion on March 3, 2023.",
+    "Case No. 2023-CV-1234 was filed under Section 12B for $5,000 in damages.",
+    "The defendant's lawyer called a witness to give testimony at trial.",
+]
+
+def baseline_extract_entities(text: str):
+    """Extraction as it was before the patterns were precompiled"""
+    entities = []
+    for label, pattern in LEGAL_PATTERNS.items():
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            entities.append({"text": match.group(), "label": label, "start": match.start(), "end": match.end()})
+    text_lower = text.lower()
+    for label, keywords in LEGAL_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in text_lower:
+                for match in re.compile(re.escape(keyword), re.IGNORECASE).finditer(text):
+                    entities.append({"text": match.group(), "label": label, "start": match.start(), "end": match.end()})
+    unique_entities = []
+    seen = set()
+    for entity in sorted(entities, key=lambda x: x["start"]):
+        entity_key = (entity["text"], entity["start"], entity["end"])
+        if entity_key not in seen:
+            seen.add(entity_key)
+            unique_entities.append(entity)
+    return unique_entities
+
+def _time(func, *args, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    document = " ".join(SAMPLES) * 2000
+    batch = SAMPLES * 500
+    assert extract_entities(document) == baseline_extract_entities(document)
+    assert extract_entities_many(batch) == [baseline_extract_entities(text) for text in batch]
+
+    print(f"{'workload':<28} {'baseline s':>11} {'current s':>10}")
+    print(f"{f'{len(document) // 1024} KB document':<28} "
+          f"{_time(baseline_extract_entities, document):>11.4f} {_time(extract_entities, document):>10.4f}")
+    print(f"{f'batch of {len(batch)} texts':<28} "
+          f"{_time(lambda: [baseline_extract_entities(text) for text in batch]):>11.4f} "
+          f"{_time(extract_entities_many, batch):>10.4f}")
+
+if __name__ == '__main__':
+    main()
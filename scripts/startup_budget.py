@@ -0,0 +1,101 @@
+"""Check that importing the app's modules stays within a startup budget.
+
+Each module is imported in a fresh interpreter, so its numbers include
+everything it pulls in. The script prints import time and peak RSS per
+module and exits non-zero if any module fails to import or exceeds the
+budget:
+
+    python scripts/startup_budget.py
+    python scripts/startup_budget.py --max-seconds 0.5 --max-rss-mb 120 app models.pipeline
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "models.analysis",
+    "models.classifier",
+    "models.ner",
+    "models.qa",
+    "models.legal_database",
+    "models.translator",
+    "models.language_detection",
+    "models.document_processor",
+    "models.feedback",
+    "models.chatbot",
+    "models.pipeline",
+    "app"
+]
+
+# Budget per module; both can be overridden from the environment or the command line
+MAX_IMPORT_SECONDS = float(os.environ.get('STARTUP_MAX_IMPORT_SECONDS', 2.0))
+MAX_RSS_MB = float(os.environ.get('STARTUP_MAX_RSS_MB', 150))
+
+# Run in the child interpreter: import one module and report the cost as JSON
+_PROBE = """
+import importlib, json, resource, sys, time
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+baseline = rss_mb()
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "rss_mb": rss_mb(), "rss_delta_mb": rss_mb() - baseline}))
+"""
+
+def measure_module(module: str) -> Dict:
+    """Import a module in a fresh interpreter and return its cost"""
+    env = dict(os.environ)
+    # Background warm-ups would make the numbers depend on timing
+    env.setdefault('PRELOAD_LANGUAGE_DETECTOR', '0')
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE, module],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return {"module": module, "error": error[-1] if error else f"exit code {completed.returncode}"}
+    # The module may print while importing; the report is the last line
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["module"] = module
+    return result
+
+def check_budget(modules: List[str], max_seconds: float, max_rss_mb: float) -> bool:
+    """Print a report for every module and return whether all are within budget"""
+    within_budget = True
+    print(f"{'module':<30} {'import s':>9} {'rss MB':>8} {'delta MB':>9}")
+    for module in modules:
+        result = measure_module(module)
+        if "error" in result:
+            print(f"{module:<30} FAILED: {result['error']}")
+            within_budget = False
+            continue
+
+        over = []
+        if result["seconds"] > max_seconds:
+            over.append(f"import time > {max_seconds}s")
+        if result["rss_mb"] > max_rss_mb:
+            over.append(f"RSS > {max_rss_mb}MB")
+        within_budget = within_budget and not over
+
+        print(f"{module:<30} {result['seconds']:>9.3f} {result['rss_mb']:>8.1f} {result['rss_delta_mb']:>9.1f}"
+              + (f"  OVER BUDGET: {', '.join(over)}" if over else ""))
+    return within_budget
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure per-module import time and RSS against a budget")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="modules to measure")
+    parser.add_argument("--max-seconds", type=float, default=MAX_IMPORT_SECONDS, help="import time budget per module")
+    parser.add_argument("--max-rss-mb", type=float, default=MAX_RSS_MB, help="peak RSS budget per module")
+    args = parser.parse_args()
+
+    return 0 if check_budget(args.modules, args.max_seconds, args.max_rss_mb) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import pytest
+
+from app import app
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+def test_analyze_rejects_non_object_body(client):
+    response = client.post('/api/analyze', json=["I was fired from my job"])
+    assert response.status_code == 400
+    assert "JSON object" in response.get_json()['error']
+
+def test_analyze_requires_inputs_list(client):
+    response = client.post('/api/analyze', json={'inputs': "I was fired"})
+    assert response.status_code == 400
+
+def test_analyze_returns_results_in_order(client):
+    response = client.post('/api/analyze', json={'inputs': ["I was fired from my job", {"text": "My landlord is evicting me"}]})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['index'] for result in results] == [0, 1]
@@ -0,0 +1,21 @@
+import asyncio
+import io
+
+from quart.datastructures import FileStorage
+
+from asgi import async_app, flask_app
+
+def test_async_app_shares_flask_limits_and_settings():
+    assert async_app.config['MAX_CONTENT_LENGTH'] == flask_app.config['MAX_CONTENT_LENGTH']
+    assert async_app.config['UPLOAD_FOLDER'] == flask_app.config['UPLOAD_FOLDER']
+    assert async_app.config['ASYNC_WORKERS'] == flask_app.config['ASYNC_WORKERS']
+
+def test_upload_over_quart_default_limit_is_accepted():
+    body = b"tenant notice " * (17 * 1024 * 1024 // 14 + 1)
+
+    async def upload():
+        client = async_app.test_client()
+        return await client.post('/upload', files={'file': FileStorage(io.BytesIO(body), 'notice.txt')})
+
+    response = asyncio.run(upload())
+    assert response.status_code == 200
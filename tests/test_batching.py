@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from models import classifier
+from models.batching import MicroBatcher
+
+def test_items_queued_before_close_are_served():
+    batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_wait_ms=20)
+    futures = [batcher.submit(i) for i in range(5)]
+    batcher.close()
+    assert [future.result(1) for future in futures] == [0, 2, 4, 6, 8]
+    with pytest.raises(RuntimeError):
+        batcher.submit(5)
+
+def test_every_submission_resolves_when_closed_concurrently():
+    batcher = MicroBatcher(lambda items: list(items), max_wait_ms=1)
+    futures, lock = [], threading.Lock()
+
+    def submit_many():
+        for i in range(200):
+            try:
+                future = batcher.submit(i)
+            except RuntimeError:
+                return
+            with lock:
+                futures.append(future)
+
+    threads = [threading.Thread(target=submit_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.005)
+    batcher.close()
+    for thread in threads:
+        thread.join()
+
+    for future in futures:
+        assert future.exception(1) is None or isinstance(future.exception(), RuntimeError)
+
+def test_classify_falls_back_to_keywords_when_batch_is_slow(monkeypatch):
+    release = threading.Event()
+    batcher = MicroBatcher(lambda contexts: release.wait(5) and ["Civil Law"] * len(contexts))
+    monkeypatch.setattr(classifier, "learned_model", object())
+    monkeypatch.setattr(classifier, "classify_batcher", batcher)
+    monkeypatch.setattr(classifier, "classify_timeout", 0.05)
+
+    start = time.monotonic()
+    assert classifier.classify("My landlord is evicting me") == "Property Law"
+    assert time.monotonic() - start < 1
+
+    release.set()
+    batcher.close()
+
+def test_classify_falls_back_to_keywords_when_batcher_was_closed(monkeypatch):
+    batcher = MicroBatcher(lambda contexts: ["Civil Law"] * len(contexts))
+    batcher.close()
+    monkeypatch.setattr(classifier, "learned_model", object())
+    monkeypatch.setattr(classifier, "classify_batcher", batcher)
+
+    assert classifier.classify("I was fired from my job") == "Labor Law"
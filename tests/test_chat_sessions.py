@@ -0,0 +1,136 @@
+import socket
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from models.chat_sessions import (RedisError, RedisSessionBackend, SessionBackend, SessionState,
+                                  SqliteSessionBackend)
+
+def _stored_ids(path):
+    with sqlite3.connect(path) as connection:
+        return sorted(row[0] for row in connection.execute('SELECT session_id FROM chat_sessions'))
+
+def test_session_backend_is_abstract():
+    with pytest.raises(TypeError):
+        SessionBackend()
+
+def test_sqlite_backend_purges_expired_sessions(tmp_path, monkeypatch):
+    path = str(tmp_path / "sessions.db")
+    backend = SqliteSessionBackend(path, ttl=60, purge_interval=3)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now - 120)
+    backend.save("abandoned-1", SessionState())
+    backend.save("abandoned-2", SessionState())
+    monkeypatch.setattr(time, "time", lambda: now)
+    assert _stored_ids(path) == ["abandoned-1", "abandoned-2"]
+
+    backend.save("active", SessionState())
+    assert _stored_ids(path) == ["active"]
+    assert backend.load("active") is not None
+
+class _RespServer:
+    """Minimal Redis-protocol stand-in: AUTH, SELECT, GET, SET [EX], DEL"""
+
+    def __init__(self, password=None):
+        self.password = password
+        self.data = {}
+        self.expiry = {}
+        self.connections = []
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self.listener.accept()
+            except OSError:
+                return
+            self.connections.append(connection)
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection):
+        reader = connection.makefile('rb')
+        authenticated = self.password is None
+        try:
+            while True:
+                line = reader.readline()
+                if not line:
+                    return
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int(reader.readline()[1:-2])
+                    args.append(reader.read(length + 2)[:-2])
+                command = args[0].decode().upper()
+                if command == 'AUTH':
+                    authenticated = args[1].decode() == self.password
+                    reply = b'+OK\r\n' if authenticated else b'-ERR invalid password\r\n'
+                elif not authenticated:
+                    reply = b'-NOAUTH Authentication required\r\n'
+                elif command == 'SELECT':
+                    reply = b'+OK\r\n'
+                elif command == 'GET':
+                    value = self.data.get(args[1])
+                    reply = b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+                elif command == 'SET':
+                    self.data[args[1]] = args[2]
+                    if len(args) == 5 and args[3].upper() == b'EX':
+                        self.expiry[args[1]] = int(args[4])
+                    reply = b'+OK\r\n'
+                elif command == 'DEL':
+                    reply = b':%d\r\n' % int(self.data.pop(args[1], None) is not None)
+                else:
+                    reply = b'-ERR unknown command\r\n'
+                connection.sendall(reply)
+        except OSError:
+            return
+
+    def drop_connections(self):
+        for connection in self.connections:
+            connection.shutdown(socket.SHUT_RDWR)
+            connection.close()
+        self.connections.clear()
+
+    def close(self):
+        self.listener.close()
+        self.drop_connections()
+
+@pytest.fixture
+def resp_server():
+    server = _RespServer(password="secret")
+    yield server
+    server.close()
+
+def test_redis_backend_round_trip(resp_server):
+    backend = RedisSessionBackend(port=resp_server.port, password="secret", db=2, ttl=90)
+    state = SessionState("housing", True)
+    state.add_turn("user", "My landlord is evicting me")
+
+    backend.save("abc", state)
+    loaded = backend.load("abc")
+    assert (loaded.primary_issue, loaded.issue_identified, list(loaded.history)) == \
+        ("housing", True, list(state.history))
+    assert resp_server.expiry[b"chat-session:abc"] == 90
+
+    backend.delete("abc")
+    assert backend.load("abc") is None
+
+def test_redis_backend_reconnects_after_dropped_connection(resp_server):
+    backend = RedisSessionBackend(port=resp_server.port, password="secret")
+    backend.save("abc", SessionState("employment"))
+
+    resp_server.drop_connections()
+
+    assert backend.load("abc").primary_issue == "employment"
+
+def test_redis_backend_does_not_keep_unauthenticated_connection(resp_server):
+    backend = RedisSessionBackend(port=resp_server.port, password="wrong")
+    with pytest.raises(RedisError):
+        backend.load("abc")
+    assert backend._local.sock is None
+
+    backend.password = "secret"
+    assert backend.load("abc") is None
@@ -0,0 +1,68 @@
+import pytest
+
+from models.analysis import AnalysisContext
+from models.classifier import DOMAIN_KEYWORDS, KEYWORD_WEIGHTS, classify, classify_with_scores
+
+def baseline_scores(text):
+    """The original per-domain substring loop the precomputed table replaces"""
+    text_lower = text.lower()
+    domain_scores = {}
+    for domain, keywords in DOMAIN_KEYWORDS.items():
+        score = 0
+        for keyword in keywords:
+            if keyword in text_lower:
+                score += KEYWORD_WEIGHTS.get(keyword, 1)
+        domain_scores[domain] = score
+    return domain_scores
+
+SAMPLES = [
+    "My landlords are evicting me",
+    "Contracts were breached",
+    "I was fired from my job after reporting harassment",
+    "The police arrested me without a search warrant",
+    "We are filing for divorce and need a custody arrangement",
+    "The adoption agency lost our adoption papers",
+    "My employer breached my employment contract",
+    "Is a paternity test required for child support?",
+    "Nothing legal here at all",
+    "",
+]
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_scores_match_baseline(text):
+    _, scores = classify_with_scores(text)
+    assert scores == baseline_scores(text)
+
+@pytest.mark.parametrize("text, domain", [
+    ("My landlords are evicting me", "Property Law"),
+    ("Contracts were breached", "Civil Law"),
+    ("My tenants stopped paying rent", "Property Law"),
+    ("The prosecutors dropped the charges", "Criminal Law"),
+])
+def test_inflected_keywords_still_match(text, domain):
+    assert classify(text) == domain
+
+def test_no_keywords_is_general_law():
+    assert classify("hello there") == "General Law"
+
+@pytest.mark.parametrize("text, keyword", [
+    ("My ex-spouse stopped paying", "spouse"),
+    ("I was laid off last week", "laid off"),
+    ("Child supports were never paid", "child support"),
+    ("We signed at-will employment terms", "at-will employment"),
+])
+def test_keywords_found_in_tokens(text, keyword):
+    assert keyword in AnalysisContext(text.lower()).keyword_hits
+
+@pytest.mark.parametrize("text, keyword", [
+    ("My parent is ill", "rent"),
+    ("I suffered an injury", "jury"),
+    ("The child is not on support", "child support"),
+])
+def test_keywords_inside_other_words_do_not_count(text, keyword):
+    assert keyword not in AnalysisContext(text).keyword_hits
+
+def test_context_hits_are_reused():
+    context = AnalysisContext("My landlord kept my security deposit")
+    assert classify_with_scores(context) == classify_with_scores(context.text)
+    assert {"landlord", "security deposit"} <= context.keyword_hits
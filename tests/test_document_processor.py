@@ -0,0 +1,88 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from models.document_processor import ExtractionPool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(max_workers=1, timeout=30.0)
+    pool.start()
+    yield pool
+    pool.close()
+
+def test_workers_are_reused_between_jobs(pool, tmp_path):
+    path = tmp_path / "notice.txt"
+    path.write_text("Notice to vacate the premises")
+    worker_pid = pool._idle[0].process.pid
+
+    for _ in range(3):
+        result = pool.extract(str(path))
+        assert result == {"text": "Notice to vacate the premises", "complete": True,
+                          "timed_out": False, "error": None}
+    assert pool._idle[0].process.pid == worker_pid
+
+def test_worker_error_is_reported(pool, tmp_path):
+    path = tmp_path / "notice.rtf"
+    path.write_text("unsupported")
+
+    result = pool.extract(str(path))
+    assert result["complete"] is False
+    assert result["error"] == "Unsupported file format"
+
+def test_timed_out_worker_is_replaced(pool, tmp_path):
+    path = tmp_path / "notice.txt"
+    path.write_text("Notice")
+    worker_pid = pool._idle[0].process.pid
+
+    result = pool.extract(str(path), timeout=0)
+    assert result["timed_out"] is True and result["complete"] is False
+    assert not pool._idle
+
+    assert pool.extract(str(path))["complete"] is True
+    assert pool._idle[0].process.pid != worker_pid
+
+def _running(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="needs /proc")
+def test_workers_exit_when_parent_is_killed():
+    script = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {ROOT!r})\n"
+        "from models.document_processor import ExtractionPool\n"
+        "pool = ExtractionPool(max_workers=2)\n"
+        "pool.start()\n"
+        "print(' '.join(str(worker.process.pid) for worker in pool._idle), flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    parent = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True)
+    worker_pids = [int(pid) for pid in parent.stdout.readline().split()]
+    assert len(worker_pids) == 2
+
+    parent.send_signal(signal.SIGKILL)
+    parent.wait()
+
+    deadline = time.monotonic() + 10
+    while any(_running(pid) for pid in worker_pids) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not any(_running(pid) for pid in worker_pids)
+
+def test_forked_pool_does_not_reuse_parent_workers(pool):
+    inherited = pool._idle[0]
+    pool._owner_pid = -1  # as seen from a forked child
+
+    pool._check_owner()
+
+    assert pool._idle == [] and pool._owner_pid == os.getpid()
+    inherited.stop()
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from models import feedback
+
+@pytest.fixture
+def feedback_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(feedback, "FEEDBACK_FILE", str(tmp_path / "feedback.json"))
+    monkeypatch.setattr(feedback, "FEEDBACK_DB", str(tmp_path / "feedback.db"))
+    monkeypatch.setattr(feedback, "_local", type(feedback._local)())
+    monkeypatch.setattr(feedback, "_aggregates_checked", False)
+    return tmp_path
+
+def test_legacy_entries_with_missing_fields_are_migrated(feedback_store):
+    legacy = [
+        {"timestamp": "2024-01-02T03:04:05", "question": "Can I be evicted?", "answer": "Maybe",
+         "rating": 4, "feedback_text": "ok", "domain": "Housing Law"},
+        {"question": "Was my firing legal?", "domain": "Employment Law"},
+        "not an entry",
+    ]
+    (feedback_store / "feedback.json").write_text(json.dumps(legacy))
+
+    rows = feedback.load_feedback()
+
+    assert len(rows) == 2
+    assert rows[0]["timestamp"] == "2024-01-02T03:04:05"
+    assert rows[1]["timestamp"]
+    assert rows[1]["rating"] == 0
+    assert rows[1]["answer"] == "" and rows[1]["feedback_text"] == ""
+    assert not (feedback_store / "feedback.json").exists()
+    assert (feedback_store / "feedback.json.migrated").exists()
+    assert feedback.get_feedback_stats()["domain_distribution"] == {"Housing Law": 1, "Employment Law": 1}
+
+def test_legacy_file_is_imported_once(feedback_store, monkeypatch):
+    legacy = [{"timestamp": "2024-01-02T03:04:05", "question": "Can I be evicted?", "rating": 4}]
+    (feedback_store / "feedback.json").write_text(json.dumps(legacy))
+    # Another worker imported the file but has not renamed it yet
+    monkeypatch.setattr(feedback.os, "replace", lambda src, dst: None)
+    assert len(feedback.load_feedback()) == 1
+
+    second_worker = feedback.sqlite3.connect(feedback.FEEDBACK_DB)
+    feedback._migrate_feedback_file(second_worker)
+
+    assert len(feedback.load_feedback()) == 1
@@ -0,0 +1,37 @@
+import pytest
+
+from models.chatbot import INTENT_ROUTER
+from models.intent_router import IntentMatch, IntentRouter
+
+@pytest.mark.parametrize("message, intent, trigger", [
+    ("my landlords want me out", "housing", "landlord"),
+    ("do i need lawyers", "lawyer", "lawyer"),
+    ("this is about my contracts", "contract", "contract"),
+    ("i am being evicted", "housing", "evicted"),
+    ("they keep charging me rent", "housing", "rent"),
+    ("what are my rights", "rights", "rights"),
+])
+def test_plural_and_inflected_triggers_route(message, intent, trigger):
+    assert INTENT_ROUTER.route(message) == IntentMatch(intent, trigger)
+
+def test_triggers_do_not_match_inside_other_words():
+    router = IntentRouter([("immediate_actions", [["do"], ["now"]])])
+    assert router.route("i do not know what to do now") == IntentMatch("immediate_actions", "do + now")
+    assert router.route("the document is unknown") is None
+
+def test_earliest_rule_wins():
+    router = IntentRouter([("first", [["fee"]]), ("second", [["fees", "cost"]])])
+    assert router.route("what are the costs and fees").intent == "first"
+
+@pytest.mark.parametrize("message, intent, trigger", [
+    ("my boss fired his assistant and me", "employment", "fired"),
+    ("his landlord evicted us", "housing", "landlord"),
+    ("what does it cost", "cost", "cost"),
+    ("hi there", "greeting", "hi"),
+])
+def test_short_triggers_only_match_whole_words(message, intent, trigger):
+    assert INTENT_ROUTER.route(message) == IntentMatch(intent, trigger)
+
+@pytest.mark.parametrize("message", ["they are hiring", "his", "this", "does it", "hid the papers"])
+def test_short_triggers_are_not_inflected(message):
+    assert INTENT_ROUTER.route(message) is None
@@ -0,0 +1,68 @@
+import csv
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from models import classifier, pipeline
+from models.classifier import DOMAIN_KEYWORDS
+from models.learned_classifier import LearnedClassifier, train_classifier
+
+@pytest.fixture(scope="module")
+def training_rows():
+    return [{"text": " ".join(keywords[i:i + 4]), "label": domain}
+            for domain, keywords in DOMAIN_KEYWORDS.items()
+            for i in range(0, len(keywords) - 3)]
+
+@pytest.fixture(scope="module")
+def training_csv(training_rows, tmp_path_factory):
+    path = tmp_path_factory.mktemp("data") / "training.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, ["text", "label"])
+        writer.writeheader()
+        writer.writerows(training_rows)
+    return str(path)
+
+@pytest.fixture(scope="module")
+def model(training_csv, tmp_path_factory):
+    model_dir = str(tmp_path_factory.mktemp("model"))
+    train_classifier(training_csv, model_dir)
+    return LearnedClassifier(model_dir)
+
+def test_vocabulary_is_memory_mapped(model):
+    assert isinstance(model.terms, np.memmap)
+    assert list(model.terms) == sorted(model.terms)
+
+def test_features_match_tfidf_vectorizer(model, training_rows):
+    texts = [row["text"] for row in training_rows] + ["my landlord evicted me", "", "unknown words only"]
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2)).fit([row["text"] for row in training_rows])
+    order = np.argsort(vectorizer.get_feature_names_out())
+
+    expected = vectorizer.transform(texts).toarray()[:, order]
+    assert np.allclose(model.transform(texts).toarray(), expected)
+
+def test_predicts_training_domains(model):
+    assert model.predict(["my landlord wants an eviction over unpaid rent"])[0][0] == "Property Law"
+
+def test_reconfiguring_the_classifier_changes_the_cache_version(training_csv, tmp_path):
+    model_dir = str(tmp_path / "model")
+    train_classifier(training_csv, model_dir)
+    try:
+        classifier.configure_classifier('learned', model_dir, min_confidence=0.0)
+        first = pipeline.analyze_request("My landlord kept my deposit")
+        learned_version = pipeline.knowledge_version
+
+        classifier.configure_classifier('learned', model_dir, min_confidence=0.9)
+        assert pipeline.knowledge_version != learned_version
+        assert pipeline.analyze_request("My landlord kept my deposit") is not first
+
+        # Retraining into the same directory is a different model
+        threshold_version = pipeline.knowledge_version
+        train_classifier(training_csv, model_dir, C=1.0)
+        classifier.configure_classifier('learned', model_dir, min_confidence=0.9)
+        assert pipeline.knowledge_version != threshold_version
+    finally:
+        classifier.configure_classifier()
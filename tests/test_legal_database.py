@@ -0,0 +1,25 @@
+from models.legal_database import LEGAL_DATABASE, SEARCH_INDEX, search_legal_database
+
+def test_filtered_scores_only_cover_their_partition():
+    terms = ["discrimination", "employment", "eviction", "the"]
+    everything = SEARCH_INDEX.score(terms)
+    filtered = SEARCH_INDEX.score(terms, "Labor Law", "statutes")
+
+    assert filtered
+    assert all(SEARCH_INDEX.documents[doc_id][:2] == ("Labor Law", "statutes") for doc_id in filtered)
+    assert filtered == {doc_id: score for doc_id, score in everything.items() if doc_id in filtered}
+    assert SEARCH_INDEX.score(terms, domain="Labor Law").keys() >= filtered.keys()
+
+def test_stopwords_are_not_indexed():
+    assert all("the" not in partition for partition in SEARCH_INDEX.postings.values())
+    assert SEARCH_INDEX.score(["the", "my", "was"]) == {}
+
+def test_query_of_stopwords_returns_default_order():
+    results = search_legal_database("Property Law", "what was the my")
+    statutes = sorted(LEGAL_DATABASE["Property Law"]["statutes"], key=lambda r: r.get("relevance_score", 0), reverse=True)
+    assert results["statutes"] == statutes[:3]
+    assert results["cases"] == LEGAL_DATABASE["Property Law"]["cases"][:2]
+
+def test_matching_record_ranks_first():
+    results = search_legal_database("Labor Law", "they refuse to pay overtime or minimum wage")
+    assert results["statutes"][0]["title"] == "Fair Labor Standards Act (FLSA)"
@@ -0,0 +1,74 @@
+import re
+
+import pytest
+
+from models.analysis import AnalysisContext
+from models.ner import LEGAL_KEYWORDS, LEGAL_PATTERNS, extract_entities, extract_entities_many
+
+def baseline_entities(text):
+    """The original per-call extraction the precompiled patterns replace"""
+    entities = []
+    for label, pattern in LEGAL_PATTERNS.items():
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            entities.append({"text": match.group(), "label": label, "start": match.start(), "end": match.end()})
+    text_lower = text.lower()
+    for label, keywords in LEGAL_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in text_lower:
+                for match in re.compile(re.escape(keyword), re.IGNORECASE).finditer(text):
+                    entities.append({"text": match.group(), "label": label, "start": match.start(), "end": match.end()})
+    unique_entities = []
+    seen = set()
+    for entity in sorted(entities, key=lambda x: x["start"]):
+        entity_key = (entity["text"], entity["start"], entity["end"])
+        if entity_key not in seen:
+            seen.add(entity_key)
+            unique_entities.append(entity)
+    return unique_entities
+
+OVERLAPPING = [
+    "John Smith Corp hired an attorney.",
+    "The District Court heard the motion.",
+    "Case No. 2023-CV-1234 was filed in the Supreme Court on March 3, 2023.",
+    "Acme Law Firm paid $5,000 in damages under Section 12B.",
+    "The industrial trial lawyers met the judge and the defendant's attorneys.",
+    "Mary Jones v. Big Company Inc, Docket Number A-77, 12/05/2021, 300 dollars",
+]
+
+@pytest.mark.parametrize("text", OVERLAPPING)
+def test_matches_baseline_on_overlapping_entities(text):
+    assert extract_entities(text) == baseline_entities(text)
+
+def test_overlapping_labels_are_all_reported():
+    entities = {(e["label"], e["text"]) for e in extract_entities("John Smith Corp")}
+    assert ("PERSON", "John Smith") in entities
+    assert ("ORGANIZATION", "John Smith Corp") in entities
+
+    # Same span under two labels: deduplicated to the first label, as before
+    entities = [(e["label"], e["text"]) for e in extract_entities("District Court")]
+    assert entities == [("PERSON", "District Court")]
+
+def test_context_and_batch_agree_with_plain_text():
+    text = OVERLAPPING[2]
+    assert extract_entities(AnalysisContext(text)) == extract_entities(text)
+    assert extract_entities_many(OVERLAPPING) == [baseline_entities(t) for t in OVERLAPPING]
+
+def test_legal_keywords_never_contain_each_other():
+    # Required for one alternation to match like one scan per keyword
+    for keywords in LEGAL_KEYWORDS.values():
+        for first in keywords:
+            assert not any(first != second and first in second for second in keywords)
+
+def test_keywords_running_into_each_other_are_all_found():
+    text = "The judgevidence and defendantrial notes"
+    assert extract_entities(text) == baseline_entities(text)
+    assert {e["text"] for e in extract_entities(text)} >= {"judge", "evidence", "defendant", "trial"}
+
+def test_batch_matches_single_texts_at_boundaries():
+    texts = ["Judge", "Smith Corp", "", "John", "Smith", "$5", "00 dollars", "a\x00b attorney"] + OVERLAPPING
+    assert extract_entities_many(texts) == [baseline_entities(t) for t in texts]
+
+def test_text_that_changes_length_when_lowercased():
+    text = "İstanbul Corp hired an ATTORNEY and a Lawyer"
+    assert extract_entities(text) == baseline_entities(text)
+    assert extract_entities_many([text, "a judge"]) == [baseline_entities(text), baseline_entities("a judge")]
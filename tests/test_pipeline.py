@@ -0,0 +1,52 @@
+import pytest
+
+from models import pipeline, qa, translator
+
+QUESTIONS = [
+    "I was fired from my job after reporting harassment",
+    "My landlord is evicting me without notice",
+    "I was fired from my job after reporting harassment",
+    "We are filing for divorce",
+]
+
+@pytest.fixture
+def uncached():
+    pipeline.configure_result_cache(0)
+    yield
+    pipeline.configure_result_cache()
+
+def test_batch_matches_single_analysis(uncached):
+    results = pipeline.analyze_batch(QUESTIONS + [42])
+    assert [result["index"] for result in results] == list(range(len(QUESTIONS) + 1))
+    for question, result in zip(QUESTIONS, results):
+        assert dict(result, index=None) == dict(pipeline.analyze(question), index=None)
+    assert "error" in results[-1]
+
+def test_batch_classifies_each_chunk_in_one_call(uncached, monkeypatch):
+    calls = []
+    classify_many = pipeline.classify_many
+    monkeypatch.setattr(pipeline, "classify_many", lambda contexts: calls.append(len(contexts)) or classify_many(contexts))
+    monkeypatch.setattr(pipeline, "BATCH_CHUNK_SIZE", 3)
+
+    results = pipeline.analyze_batch(QUESTIONS * 2)
+
+    assert len(results) == 8
+    # Repeated questions are analyzed once
+    assert calls == [2, 1]
+
+@pytest.fixture
+def cached():
+    pipeline.configure_result_cache()
+    yield pipeline.result_cache
+
+@pytest.mark.parametrize("rebuild", [translator.rebuild_translators, qa.rebuild_answer_catalogs])
+def test_rebuilds_are_not_served_from_cache(cached, rebuild):
+    question = "My landlord will not return my security deposit"
+    first = pipeline.analyze_request(question, 'es')
+    assert pipeline.analyze_request(question, 'es') is first
+
+    rebuild()
+
+    hits = cached.hits
+    assert pipeline.analyze_request(question, 'es') is not first
+    assert cached.hits == hits